@@ -28,6 +28,7 @@ setuptools.setup(
     long_description_content_type="text/markdown",
     packages=["system97"],
     scripts=["scripts/system97"],
+    extras_require={"numpy": ["numpy"]},
     classifiers=[
         "Development Status :: 4 - Beta",
         "Environment :: Console",
@@ -0,0 +1,436 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# analysis.py
+# Copyright (c) 2020 Hugh Coleman
+#
+# This file is part of hughcoleman/system97, a historically accurate simulator
+# of the "System 97" or Type-B Cipher Machine. It is released under the MIT
+# License (see LICENSE.)
+""" Implements tools for the cryptanalysis of System97 traffic.
+
+Known-plaintext attacks are built upon an inverted index of the wiring: for
+every input and output of the sixes switch, a bitset of the positions at which
+the switch routes that input to that output, and likewise for the twenties
+switches taken together, over their 15,625 joint positions. A crib (a stretch
+of plaintext and the ciphertext that it is known to encrypt to) is then
+reduced to the starting states that are consistent with it by intersecting
+the bitsets of each of its letters. Before that, a crib of plaintext alone can
+be placed in a message by the pattern of its sixes letters, which the machine
+preserves.
+
+Ciphertext-only attacks begin with the sixes, as the sixes letters undergo a
+substitution which repeats every 25 characters. The sixes letters, the order
+in which they are wired into the plugboard and the starting position of the
+sixes switch can therefore be recovered from frequency statistics over the 25
+residue classes of a message.
+
+This module requires NumPy, which can be installed alongside this package with
+the `numpy` extra.
+"""
+import functools
+import itertools
+
+import numpy
+
+import system97.engine
+import system97.logic
+import system97.machine
+import system97.plugboard
+
+
+def members(bitset):
+    """ Return the indices of the bits which are set in a bitset. """
+
+    data = numpy.frombuffer(
+        bitset.to_bytes((bitset.bit_length() + 7) // 8, "little"),
+        dtype=numpy.uint8,
+    )
+    bits = numpy.unpackbits(data, bitorder="little")
+
+    return numpy.flatnonzero(bits).tolist()
+
+
+@functools.lru_cache(maxsize=None)
+def index():
+    """Return the inverted index of the wiring, as a pair `(sixes,
+    twenties)`.
+
+    `sixes[n][x]` is a bitset of the positions of the sixes switch at which
+    input `n` is routed to output `x` when decrypting, and
+    `twenties[n - 6][x - 6]` is a bitset of the joint positions of the twenties
+    switches (see `system97.engine.twenties_index`, divided by 20) at which the
+    same holds.
+    """
+
+    forward = system97.logic.forward("SIXES")
+    sixes = [[0] * 6 for _ in range(6)]
+    for p in range(25):
+        for n in range(6):
+            sixes[n][forward[p * 6 + n]] |= 1 << p
+
+    _, decrypt = system97.engine.twenties()
+    bits = [bytearray((25 ** 3 + 7) // 8) for _ in range(20 * 20)]
+    for j in range(25 ** 3):
+        for n in range(20):
+            bits[n * 20 + decrypt[j * 20 + n] - 6][j >> 3] |= 1 << (j & 7)
+
+    twenties = [
+        [int.from_bytes(bits[n * 20 + x], "little") for x in range(20)]
+        for n in range(20)
+    ]
+
+    return sixes, twenties
+
+
+def _rotate(bitset, r):
+    """ Rotate a bitset of 25 positions right by `r` places. """
+
+    r %= 25
+    return ((bitset >> r) | (bitset << (25 - r))) & ((1 << 25) - 1)
+
+
+def _positions(state, t):
+    """Return the joint position of the twenties switches, `t` steps after
+    the supplied starting state.
+    """
+
+    sixes, i, ii, iii, speeds = state
+
+    positions = [None, i, ii, iii]
+    steps = system97.machine.count_steps(sixes, positions[speeds[1]], t)
+    for switch, n in zip(speeds, steps):
+        positions[switch] = (positions[switch] + n) % 25
+
+    return (positions[1] * 25 + positions[2]) * 25 + positions[3]
+
+
+def candidates(plaintext, ciphertext, plugboard, offset=0):
+    """Yield every starting state `(sixes, I, II, III, speeds)`, of the form
+    returned by `System97.snapshot`, under which the supplied crib would be
+    decrypted correctly, given the plugboard.
+
+    The crib is a stretch of `plaintext` and the `ciphertext` that it encrypts
+    to, beginning at character `offset` of the message. Illegible characters
+    in either are ignored.
+    """
+
+    if len(plaintext) != len(ciphertext):
+        raise ValueError("plaintext and ciphertext cribs differ in length")
+
+    plugboard = system97.plugboard.Plugboard(plugboard)
+    sixes_index, twenties_index = index()
+
+    sixes = (1 << 25) - 1
+    twenties = []
+    for t, (p, c) in enumerate(zip(plaintext, ciphertext), offset):
+        if (p in ["-", "/", " "]) or (c in ["-", "/", " "]):
+            continue
+
+        n, x = plugboard.index(c), plugboard.index(p)
+        if (n < 6) != (x < 6):
+            # the sixes and twenties are never mixed
+            return
+        elif n < 6:
+            sixes &= _rotate(sixes_index[n][x], t)
+        else:
+            twenties.append((t, twenties_index[n - 6][x - 6]))
+
+    for s in members(sixes):
+        for fast, medium, slow in itertools.permutations([1, 2, 3]):
+            speeds = (fast, medium, slow)
+
+            if not twenties:
+                for i, ii, iii in itertools.product(range(25), repeat=3):
+                    yield (s, i, ii, iii, speeds)
+                continue
+
+            # seed the candidates from the first twenties letter of the crib,
+            # by stepping each of its consistent positions back to the start
+            # of the message
+            t, bitset = twenties[0]
+            for j in members(bitset):
+                positions = [None, j // 625, j // 25 % 25, j % 25]
+
+                # the medium switch steps a fixed number of times, regardless
+                # of the starting positions
+                positions[medium] = (positions[medium] - (s + t) // 25) % 25
+                steps = system97.machine.count_steps(s, positions[medium], t)
+                positions[fast] = (positions[fast] - steps[0]) % 25
+                positions[slow] = (positions[slow] - steps[2]) % 25
+
+                state = (s, positions[1], positions[2], positions[3], speeds)
+
+                # and intersect them with the remaining letters
+                if all(
+                    (bitset_ >> _positions(state, t_)) & 1
+                    for t_, bitset_ in twenties[1:]
+                ):
+                    yield state
+
+
+def _mask(text, letters):
+    """Return a bitset of the positions in text which hold one of the
+    supplied letters.
+    """
+
+    table = bytearray(b"0" * 256)
+    for c in letters:
+        table[ord(c)] = ord("1")
+
+    return int(text.encode("ascii").translate(table)[::-1] or b"0", 2)
+
+
+def find_crib(ciphertext, crib, sixes_letters):
+    """Return every offset into the ciphertext at which the supplied crib of
+    plaintext could lie, given the six sixes letters of the plugboard.
+
+    The machine only ever substitutes sixes letters for sixes letters and
+    twenties letters for twenties letters, so the crib can only lie where its
+    sixes letters line up with those of the ciphertext. Illegible characters
+    in either match anything.
+
+    Every offset is tested at once, in the style of the shift-and algorithm:
+    the ciphertext is reduced to a bitset of the positions that could hold a
+    sixes letter, and another of those that could hold a twenties letter, and
+    the offsets that remain are those at which every letter of the crib finds
+    a match in the appropriate bitset.
+    """
+
+    if len(set(sixes_letters)) != 6:
+        raise ValueError(f"{sixes_letters!r} is not six distinct letters")
+
+    letters = system97.machine.System97.CHARSET
+    illegible = "-/ "
+    for text in [ciphertext, crib]:
+        invalid = set(text) - letters - set(illegible)
+        if invalid:
+            c = min(invalid)
+            raise ValueError(f"{c!r} is neither a letter nor illegible")
+
+    if len(crib) > len(ciphertext):
+        return []
+
+    sixes = "".join(sixes_letters)
+    twenties = "".join(letters - set(sixes_letters))
+    masks = {
+        True: _mask(ciphertext, sixes + illegible),
+        False: _mask(ciphertext, twenties + illegible),
+    }
+
+    offsets = (1 << (len(ciphertext) - len(crib) + 1)) - 1
+    for k, c in enumerate(crib):
+        if c not in illegible:
+            offsets &= masks[c in sixes_letters] >> k
+
+    return members(offsets)
+
+
+# the relative frequencies of the letters in English text
+ENGLISH = {
+    "A": 0.0817,
+    "B": 0.0149,
+    "C": 0.0278,
+    "D": 0.0425,
+    "E": 0.1270,
+    "F": 0.0223,
+    "G": 0.0202,
+    "H": 0.0609,
+    "I": 0.0697,
+    "J": 0.0015,
+    "K": 0.0077,
+    "L": 0.0403,
+    "M": 0.0241,
+    "N": 0.0675,
+    "O": 0.0751,
+    "P": 0.0193,
+    "Q": 0.0010,
+    "R": 0.0599,
+    "S": 0.0633,
+    "T": 0.0906,
+    "U": 0.0276,
+    "V": 0.0098,
+    "W": 0.0236,
+    "X": 0.0015,
+    "Y": 0.0197,
+    "Z": 0.0007,
+}
+
+
+def residue_counts(ciphertext):
+    """Return the number of occurrences of each letter of the alphabet in
+    each of the 25 residue classes of the supplied ciphertext, as a 26 by 25
+    array. Illegible characters are ignored.
+    """
+
+    data = numpy.frombuffer(ciphertext.encode("ascii"), dtype=numpy.uint8)
+    offsets = numpy.arange(len(data)) % 25
+
+    letters = (data >= ord("A")) & (data <= ord("Z"))
+    counts = numpy.zeros((26, 25), dtype=numpy.int64)
+    numpy.add.at(counts, (data[letters] - ord("A"), offsets[letters]), 1)
+
+    return counts
+
+
+@functools.lru_cache(maxsize=None)
+def _sixes_orders():
+    """Return every ordering of the sixes letters on the plugboard, as an
+    array `orders` such that `orders[h, n]` is the letter wired to input `n`
+    under the h-th ordering, together with an array `pairings`, such that
+    `orders[pairings[h, s, r] - r * len(orders)]` maps each ciphertext letter
+    to the plaintext letter that it decrypts to, under the h-th ordering, in
+    the r-th residue class of a message which begins at position `s` of the
+    sixes switch.
+
+    Each ordering, composed with the wiring at a position of the switch, is
+    itself an ordering, so a message can be scored against every one of them
+    once per residue class, rather than once per ordering and position. The
+    pairings are offset by residue class, so that they index directly into the
+    flattened table of those scores.
+    """
+
+    orders = list(itertools.permutations(range(6)))
+    lookup = {order: h for h, order in enumerate(orders)}
+
+    forward = system97.logic.forward("SIXES")
+    composed = numpy.array(
+        [
+            [
+                lookup[
+                    tuple(
+                        order[forward[p * 6 + order.index(c)]]
+                        for c in range(6)
+                    )
+                ]
+                for p in range(25)
+            ]
+            for order in orders
+        ]
+    )
+    positions = (numpy.arange(25)[:, None] + numpy.arange(25)[None, :]) % 25
+
+    pairings = composed[:, positions] + numpy.arange(25) * len(orders)
+
+    return numpy.array(orders), numpy.ascontiguousarray(pairings)
+
+
+def _sixes_scores(counts, logp):
+    """Return the log-likelihood of the sixes letters of a message under
+    every ordering of the sixes letters and every starting position of the
+    sixes switch, as an array indexed by `[h, s]` (see `_sixes_orders`).
+
+    `counts[r, c]` is the number of occurrences of the c-th sixes letter in
+    the r-th residue class, and `logp[c]` the log-probability of the c-th
+    sixes letter in the plaintext.
+    """
+
+    orders, pairings = _sixes_orders()
+
+    # the score of each residue class under every pairing of the letters
+    scores = counts @ logp[orders].T
+
+    return numpy.take(scores, pairings).sum(axis=2)
+
+
+def sixes_letters(ciphertext, pool=10, frequencies=ENGLISH):
+    """Identify the six sixes letters of the plugboard from the supplied
+    ciphertext alone, and return every candidate set of letters as a list of
+    `(score, letters)` pairs, best first, with the letters of each set in
+    alphabetical order.
+
+    Within each of the 25 residue classes of the message, the sixes letters
+    undergo a fixed monoalphabetic substitution, and so the frequency of each
+    of them varies markedly from one class to another. The twenties letters,
+    whose substitution changes with every character, are spread much more
+    evenly. The `pool` letters whose counts are most dispersed across the
+    residue classes (by their chi-squared statistic) are kept, and every set
+    of six of them is scored by how much better the sixes switch explains its
+    counts (see `recover_sixes`) than counts which do not depend on the
+    residue class at all, per occurrence of its letters.
+
+    The statistic is only reliable for messages of roughly 1,000 characters
+    or more; shorter messages should be cross-checked against the runner-up
+    sets, or have their letters supplied to `recover_sixes` directly.
+    """
+
+    counts = residue_counts(ciphertext)
+
+    expected = counts.sum(axis=1, keepdims=True) / 25
+    dispersion = ((counts - expected) ** 2 / numpy.maximum(expected, 1)).sum(
+        axis=1
+    )
+
+    results = []
+    for letters in itertools.combinations(
+        sorted(numpy.argsort(-dispersion)[:pool]), 6
+    ):
+        counts_ = counts[list(letters)].T
+        totals = counts_.sum(axis=0)
+        if not totals.all():
+            # the sixes letters appear in every message of any length
+            continue
+
+        probabilities = numpy.array(
+            [frequencies[chr(ord("A") + n)] for n in letters]
+        )
+        logp = numpy.log(probabilities / probabilities.sum())
+
+        # the log-likelihood of the counts, were every residue class to
+        # share the same distribution of letters
+        uniform = (totals * numpy.log(totals / totals.sum())).sum()
+
+        results.append(
+            (
+                float(
+                    (_sixes_scores(counts_, logp).max() - uniform)
+                    / totals.sum()
+                ),
+                "".join(chr(ord("A") + n) for n in letters),
+            )
+        )
+
+    return sorted(results, reverse=True)
+
+
+def recover_sixes(ciphertext, letters=None, frequencies=ENGLISH):
+    """Recover the starting position of the sixes switch and the order of the
+    sixes letters on the plugboard from the supplied ciphertext alone.
+
+    `letters` are the six sixes letters, in any order; if they are not
+    supplied, the best candidate from `sixes_letters` is taken. Every ordering
+    of the letters and every starting position is tried at once, and each is
+    scored by the log-likelihood of the sixes letters that it decrypts to,
+    under the supplied letter `frequencies`.
+
+    Returns a dictionary with the keys `plugboard` (the first six letters of
+    the plugboard, in order), `position` (the starting position of the sixes
+    switch) and `score`.
+    """
+
+    if letters is None:
+        ranked = sixes_letters(ciphertext, frequencies=frequencies)
+        if not ranked:
+            raise ValueError("too few letters to identify the sixes letters")
+
+        _, letters = ranked[0]
+
+    letters = "".join(sorted(letters))
+    if len(set(letters)) != 6:
+        raise ValueError(f"{letters!r} are not six distinct letters")
+
+    # counts[r, c] is the number of occurrences of the c-th sixes letter in
+    # the r-th residue class
+    counts = residue_counts(ciphertext)[[ord(c) - ord("A") for c in letters]].T
+
+    probabilities = numpy.array([frequencies[c] for c in letters])
+    logp = numpy.log(probabilities / probabilities.sum())
+
+    scores = _sixes_scores(counts, logp)
+    h, s = numpy.unravel_index(numpy.argmax(scores), scores.shape)
+
+    orders, _ = _sixes_orders()
+    return {
+        "plugboard": "".join(letters[n] for n in orders[h]),
+        "position": int(s),
+        "score": float(scores[h, s]),
+    }
@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# codebook.py
+# Copyright (c) 2020 Hugh Coleman
+#
+# This file is part of hughcoleman/system97, a historically accurate simulator
+# of the "System 97" or Type-B Cipher Machine. It is released under the MIT
+# License (see LICENSE.)
+""" Implements an on-disk codebook for the System97 simulator.
+
+The four stepping switches have 25 ** 4 = 390,625 joint positions. For each of
+them, the codebook records the full 26-letter substitution performed by the
+switches (excluding the plugboard), indexed as follows.
+
+    (((S * 25 + I) * 25 + II) * 25 + III) * 26 + n
+
+where `S` is the position of the sixes switch, `I`, `II` and `III` are the
+positions of the twenties switches, and `n` is the signal that is fed into
+them. Encryption and decryption each take a single lookup per character.
+
+Note that the speeds of the twenties switches only determine the order in
+which the joint positions are visited, and not the substitution performed at
+each of them, so a single codebook serves all six speed orders.
+
+The codebook weighs in at about 20 MB, and is stored in a file which is
+memory-mapped on first use, so that every process on a host shares the same
+physical pages. It must be built ahead of time, by executing the following
+command, or by passing `create=True` to `load` or `CodebookSystem97`.
+
+    python -m system97.codebook [PATH]
+
+"""
+import functools
+import mmap
+import os
+import pathlib
+import sys
+import tempfile
+
+import system97.engine
+import system97.logic
+import system97.machine
+
+MAGIC = b"SYS97CB1"
+
+# the number of joint positions of the four stepping switches
+STATES = 25 ** 4
+
+# the weights of the positions of the sixes switch and of twenties switches I,
+# II and III in an offset into the codebook (see `system97.engine.windows`)
+WEIGHTS = (25 ** 3 * 26, 25 ** 2 * 26, 25 * 26, 26)
+
+
+def default_path():
+    """Return the default location of the codebook; this can be overridden
+    by setting the `SYSTEM97_CODEBOOK` environment variable.
+    """
+
+    if "SYSTEM97_CODEBOOK" in os.environ:
+        return pathlib.Path(os.environ["SYSTEM97_CODEBOOK"])
+
+    cache = os.environ.get("XDG_CACHE_HOME") or pathlib.Path.home() / ".cache"
+    return pathlib.Path(cache) / "system97" / "codebook"
+
+
+def state_index(sixes, i, ii, iii):
+    """Return the offset into the codebook for the supplied switch
+    positions.
+    """
+
+    return (((sixes * 25 + i) * 25 + ii) * 25 + iii) * 26
+
+
+def codebooks():
+    """Return the `(encrypt, decrypt)` codebooks, as a pair of `bytes`
+    objects.
+    """
+
+    encrypt_, decrypt_ = system97.engine.twenties()
+
+    codebooks = []
+    for sixes, twenties in [
+        (system97.logic.inverse("SIXES"), encrypt_),
+        (system97.logic.forward("SIXES"), decrypt_),
+    ]:
+        rows = [twenties[k : k + 20] for k in range(0, len(twenties), 20)]
+        codebooks.append(
+            b"".join(
+                sixes[s * 6 : (s + 1) * 6] + row
+                for s in range(25)
+                for row in rows
+            )
+        )
+
+    return tuple(codebooks)
+
+
+def build(path=None):
+    """Build the codebook, and write it to the supplied path (or the default
+    location). The file is replaced atomically, so that processes which have
+    already mapped an older copy are unaffected, and is made readable by every
+    user, so that they can share it.
+    """
+
+    path = pathlib.Path(path or default_path())
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    encrypt, decrypt = codebooks()
+
+    fd, temporary = tempfile.mkstemp(dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(MAGIC)
+            fh.write(encrypt)
+            fh.write(decrypt)
+
+        # mkstemp creates the file readable only by its owner
+        os.chmod(temporary, 0o644)
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+    return path
+
+
+@functools.lru_cache(maxsize=None)
+def load(path=None, create=False):
+    """Memory-map the codebook at the supplied path (or the default
+    location), and return the `(encrypt, decrypt)` codebooks as a pair of
+    read-only `memoryview`s.
+
+    If the codebook does not exist, it is built first when `create` is set,
+    and a FileNotFoundError is raised otherwise.
+    """
+
+    path = pathlib.Path(path or default_path())
+    if not path.exists():
+        if not create:
+            raise FileNotFoundError(
+                f"no codebook at {str(path)!r}; build it with "
+                f"`python -m system97.codebook {str(path)}`"
+            )
+
+        build(path)
+
+    with open(path, "rb") as fh:
+        mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if (len(mm) != len(MAGIC) + 2 * STATES * 26) or (
+        mm[: len(MAGIC)] != MAGIC
+    ):
+        mm.close()
+        raise ValueError(f"{str(path)!r} is not a valid codebook")
+
+    view = memoryview(mm)[len(MAGIC) :]
+    return view[: STATES * 26], view[STATES * 26 :]
+
+
+class CodebookSystem97(system97.machine.System97):
+    """A System97 which encrypts and decrypts using the memory-mapped
+    codebook, performing a single lookup per character.
+
+    """
+
+    __slots__ = ("codebook",)
+
+    def _translate_into(self, src, dst, encrypt):
+        """Feed the contents of the buffer `src` through the machine, in the
+        direction given by `encrypt`, writing the output into the buffer `dst`.
+
+        The whole buffer is translated through the plugboard first, so that a
+        character which is not wired into it is reported before the machine is
+        stepped. It is then processed in windows, the positions of the switches
+        over each of which are computed by `system97.engine.windows`.
+        """
+
+        codebook = self.codebook[0 if encrypt else 1]
+
+        data = self.plugboard.encode(src)
+
+        for start, (positions, bases) in zip(
+            range(0, len(data), system97.engine.WINDOW),
+            system97.engine.windows(
+                self.snapshot(), len(data), weights=WEIGHTS
+            ),
+        ):
+            window = data[start : start + len(positions)]
+
+            x = bytearray(window)
+            for k, n in enumerate(window):
+                if n < 26:
+                    x[k] = codebook[bases[k] + n]
+
+            dst[start : start + len(x)] = x.translate(self.plugboard.reverse)
+
+        self.advance(len(data))
+
+    def __init__(self, *args, codebook=None, create=False, **kwargs):
+        """Construct a machine which uses the codebook at the supplied path,
+        or the default location, building it first if `create` is set (see
+        `load`). The remaining arguments are as for System97.
+        """
+
+        super().__init__(*args, **kwargs)
+
+        self.codebook = load(codebook, create)
+
+
+if __name__ == "__main__":
+    print(build(sys.argv[1] if len(sys.argv) > 1 else None))
@@ -0,0 +1,331 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# engine.py
+# Copyright (c) 2020 Hugh Coleman
+#
+# This file is part of hughcoleman/system97, a historically accurate simulator
+# of the "System 97" or Type-B Cipher Machine. It is released under the MIT
+# License (see LICENSE.)
+""" Implements a compiled engine for the System97 simulator.
+
+The three twenties switches only have 25 ** 3 = 15,625 joint positions, so the
+combined permutation that they perform on the twenties letters can be computed
+ahead of time for every triple of positions. The resulting tables are indexed
+as follows.
+
+    ((I * 25 + II) * 25 + III) * 20 + (n - 6)
+
+where `I`, `II` and `III` are the positions of the twenties switches and `n` is
+the signal (6 through 25) that is fed into them. Each table weighs in at about
+300 KB, and is built once per process on first use.
+
+Similarly, the sequence of positions that the stepping switches pass through
+depends only on their starting positions and speeds, and not on the text. It is
+computed a window at a time from the pattern in which the fast, medium and
+slow switches step (see `step_pattern`), rather than by stepping the machine.
+Callers which decrypt repeatedly under the same settings can instead take it
+from the trajectory cache (see `trajectory`).
+"""
+import array
+import functools
+import itertools
+import operator
+import sys
+
+import system97.machine
+import system97.switch
+
+# the number of trajectories kept by the cache, and the number of characters
+# in each of the windows processed by CompiledSystem97
+TRAJECTORIES = 256
+WINDOW = 4096
+
+
+def twenties_index(i, ii, iii):
+    """Return the offset into the compiled twenties tables for the supplied
+    switch positions.
+    """
+
+    return ((i * 25 + ii) * 25 + iii) * 20
+
+
+@functools.lru_cache(maxsize=None)
+def twenties():
+    """Return the compiled `(encrypt, decrypt)` tables for the twenties
+    switches, as a pair of `bytes` objects.
+    """
+
+    switches = [
+        system97.switch.SteppingSwitch(name)
+        for name in ["TWENTIES_I", "TWENTIES_II", "TWENTIES_III"]
+    ]
+    forward = [switch.forward for switch in switches]
+    inverse = [switch.inverse for switch in switches]
+
+    encrypt = bytearray(25 ** 3 * 20)
+    decrypt = bytearray(25 ** 3 * 20)
+    for i in range(25):
+        for ii in range(25):
+            # compose the first two switches once, rather than once for every
+            # position of the third
+            encrypt_ = [inverse[1][ii][inverse[0][i][n]] for n in range(6, 26)]
+            decrypt_ = [forward[0][i][forward[1][ii][n]] for n in range(6, 26)]
+
+            for iii in range(25):
+                base = twenties_index(i, ii, iii)
+                encrypt[base : base + 20] = bytes(
+                    inverse[2][iii][n] for n in encrypt_
+                )
+                decrypt[base : base + 20] = bytes(
+                    decrypt_[forward[2][iii][n] - 6] for n in range(6, 26)
+                )
+
+    return bytes(encrypt), bytes(decrypt)
+
+
+def step_pattern(sixes, medium, length):
+    """Return which of the fast (0), medium (1) and slow (2) switches steps at
+    each of `length` steps, as a `bytearray`, given the starting positions of
+    the sixes and medium switches.
+
+    The medium switch steps on every visit of the sixes switch to position 24,
+    and the slow switch on every 25th visit to position 23 (see
+    `system97.machine.count_steps`), so the pattern is filled in with a pair of
+    slice assignments.
+    """
+
+    pattern = bytearray(length)
+
+    start = (24 - sixes) % 25
+    pattern[start::25] = b"\x01" * len(range(start, length, 25))
+
+    first = (24 - medium - (sixes == 24)) % 25
+    start = (23 - sixes) % 25 + 25 * first
+    pattern[start::625] = b"\x02" * len(range(start, length, 625))
+
+    return pattern
+
+
+# the translation tables which pick out the steps of each of the fast, medium
+# and slow switches from a step pattern
+ROLES = [bytes(n == role for n in range(256)) for role in range(3)]
+
+
+# the positions of the sixes switch over a window, from each starting position
+CYCLE = bytes(range(25)) * (WINDOW // 25 + 2)
+
+
+# the weights of the positions of the sixes switch and of twenties switches I,
+# II and III in an offset into the compiled twenties tables, and in a packed
+# trajectory (see `walk`)
+TWENTIES = (0, 25 * 25 * 20, 25 * 20, 20)
+PACKED = (1, 1 << 8, 1 << 16, 1 << 24)
+
+
+@functools.lru_cache(maxsize=None)
+def _scales(weights):
+    """Return, for the sixes switch and each of the twenties switches, a
+    table mapping the number of steps from position 0 to the switch's
+    contribution to an offset with the supplied weights, covering a window of
+    steps from any position.
+    """
+
+    return [
+        [(k % 25) * weight for k in range(WINDOW + 25)] for weight in weights
+    ]
+
+
+def windows(state, length, pattern=None, weights=TWENTIES):
+    """Yield the positions of the sixes switch and the offsets into the
+    compiled twenties tables, as `offsets` does, over each successive window of
+    `WINDOW` steps of the `length` steps beginning from the supplied state.
+
+    Callers which process a long message a window at a time can use this to
+    keep their memory use bounded by the size of a window. Callers which need
+    offsets into some other table may supply the `weights` of the positions of
+    the sixes switch and of twenties switches I, II and III in an offset.
+    """
+
+    sixes, i, ii, iii, speeds = state
+    positions = [None, i, ii, iii]
+
+    if pattern is None:
+        pattern = step_pattern(sixes, positions[speeds[1]], length)
+    scales = _scales(weights)
+
+    for start in range(0, length, WINDOW):
+        steps = pattern[start : min(start + WINDOW, length)]
+        first = (sixes + start) % 25
+        cycle = CYCLE[first : first + len(steps)]
+
+        # count the steps taken by each switch up to every offset, and scale
+        # the resulting positions into offsets
+        columns = [
+            map(
+                scales[n].__getitem__,
+                itertools.accumulate(
+                    steps.translate(ROLES[role]), initial=positions[n]
+                ),
+            )
+            for role, n in enumerate(speeds)
+        ]
+        if weights[0]:
+            columns.append(map(scales[0].__getitem__, cycle))
+
+        yield (
+            cycle,
+            list(
+                itertools.islice(
+                    functools.reduce(
+                        lambda x, y: map(operator.add, x, y), columns
+                    ),
+                    len(steps),
+                )
+            ),
+        )
+
+        for role, n in enumerate(speeds):
+            positions[n] = (positions[n] + steps.count(role)) % 25
+
+
+def offsets(state, length, pattern=None):
+    """Return the positions of the sixes switch over `length` steps, beginning
+    from the supplied state, as a `bytes` object, together with the offsets
+    into the compiled twenties tables for the positions of the twenties
+    switches, as a list.
+
+    Both are computed from the step pattern of the fast, medium and slow
+    switches, without stepping the machine. Callers which visit many states
+    sharing the same position of the sixes switch may supply the `pattern`
+    for the state, as returned by `step_pattern`.
+    """
+
+    positions, indices = bytearray(), []
+    for positions_, indices_ in windows(state, length, pattern):
+        positions += positions_
+        indices += indices_
+
+    return bytes(positions), indices
+
+
+def walk(state, length):
+    """Return the positions of the stepping switches over `length` steps,
+    beginning from the supplied state (see `System97.snapshot`).
+
+    The positions are packed into a `bytes` object of `4 * length` bytes, with
+    the positions of the sixes and of twenties switches I, II and III at offset
+    `k` beginning at index `4 * k`. They are computed by `windows`, with each
+    step's positions packed into the bytes of a single 32-bit word.
+    """
+
+    packed = array.array("I")
+    for _, words in windows(state, length, weights=PACKED):
+        packed.extend(words)
+
+    # the words are packed least significant byte first
+    if sys.byteorder == "big":
+        packed.byteswap()
+
+    return packed.tobytes()
+
+
+@functools.lru_cache(maxsize=TRAJECTORIES)
+def trajectory(state, length):
+    """Return the positions of the stepping switches over `length` steps, as
+    `walk` does, from the cache.
+
+    Callers which visit many different states only once (such as a key
+    search) should call `walk` directly, rather than flush the cache.
+    """
+
+    return walk(state, length)
+
+
+def route_offsets(data, positions, indices, sixes, twenties):
+    """Route each of the signals in `data` (as translated through the
+    plugboard) through the switches, given the positions of the sixes switch
+    and the offsets into the compiled twenties table over the data (as
+    returned by `offsets`), the routing of the sixes switch and the compiled
+    twenties table for the direction, and return the output signals as a
+    `bytearray`. Illegible characters are passed through unchanged.
+    """
+
+    x = bytearray(data)
+    for k, n in enumerate(data):
+        if n < 6:
+            x[k] = sixes[positions[k]][n]
+        elif n < 26:
+            x[k] = twenties[indices[k] + n - 6]
+
+    return x
+
+
+class CompiledSystem97(system97.machine.System97):
+    """A System97 which routes the twenties letters through the compiled
+    twenties tables, performing a single lookup per character instead of three.
+
+    """
+
+    __slots__ = ("compiled",)
+
+    def _translate_into(self, src, dst, encrypt):
+        """Feed the contents of the buffer `src` through the machine, in the
+        direction given by `encrypt`, writing the output into the buffer `dst`.
+
+        The whole buffer is translated through the plugboard first, so that a
+        character which is not wired into it is reported before the machine is
+        stepped. It is then routed in windows, the positions of the switches
+        over each of which are computed by `windows`.
+        """
+
+        if encrypt:
+            sixes, twenties = self.sixes.inverse, self.compiled[0]
+        else:
+            sixes, twenties = self.sixes.forward, self.compiled[1]
+
+        data = self.plugboard.encode(src)
+
+        for start, (positions, indices) in zip(
+            range(0, len(data), WINDOW), windows(self.snapshot(), len(data))
+        ):
+            x = route_offsets(
+                data[start : start + len(positions)],
+                positions,
+                indices,
+                sixes,
+                twenties,
+            )
+            dst[start : start + len(x)] = x.translate(self.plugboard.reverse)
+
+        self.advance(len(data))
+
+    def decrypt_twenties(self, n):
+        """ Route the supplied signal forwards through the twenties. """
+
+        return self.compiled[1][
+            twenties_index(
+                self.twenties[1].position,
+                self.twenties[2].position,
+                self.twenties[3].position,
+            )
+            + n
+            - 6
+        ]
+
+    def encrypt_twenties(self, n):
+        """ Route the supplied signal backwards through the twenties. """
+
+        return self.compiled[0][
+            twenties_index(
+                self.twenties[1].position,
+                self.twenties[2].position,
+                self.twenties[3].position,
+            )
+            + n
+            - 6
+        ]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.compiled = twenties()
@@ -18,1798 +18,208 @@ publication.
 Each stepper switch's wiring logic is encoded in a two-dimensional array. The
 rows are each associated with an input letter, and the columns are each
 associated with a wiper arm position.
+
+To keep the cost of importing this module down, the arrays are shipped packed
+into `bytes`, one row of 25 bytes per input letter, and are only unpacked into
+the dictionaries `SIXES`, `TWENTIES_I`, `TWENTIES_II` and `TWENTIES_III` on
+first access. Code that is able to work with the packed representation can use
+`forward` and `inverse` instead, which return the wiring (and its inverse) as
+position-major lookup tables.
 """
+import functools
 
-SIXES = {
-    0: [
-        1,
-        5,
-        0,
-        3,
-        2,
-        1,
-        5,
-        2,
-        4,
-        3,
-        1,
-        4,
-        2,
-        3,
-        0,
-        4,
-        5,
-        1,
-        0,
-        2,
-        5,
-        0,
-        5,
-        3,
-        4,
-    ],
-    1: [
-        0,
-        2,
-        4,
-        2,
-        5,
-        0,
-        4,
-        5,
-        3,
-        4,
-        0,
-        3,
-        0,
-        1,
-        5,
-        3,
-        1,
-        2,
-        1,
-        0,
-        4,
-        2,
-        3,
-        5,
-        1,
-    ],
-    2: [
-        2,
-        4,
-        3,
-        1,
-        0,
-        5,
-        3,
-        0,
-        1,
-        2,
-        3,
-        5,
-        1,
-        4,
-        1,
-        2,
-        4,
-        3,
-        2,
-        5,
-        0,
-        5,
-        4,
-        0,
-        3,
-    ],
-    3: [
-        4,
-        1,
-        5,
-        0,
-        3,
-        4,
-        1,
-        3,
-        5,
-        1,
-        4,
-        2,
-        5,
-        0,
-        2,
-        5,
-        2,
-        0,
-        4,
-        3,
-        1,
-        3,
-        0,
-        1,
-        2,
-    ],
-    4: [
-        3,
-        0,
-        1,
-        5,
-        4,
-        2,
-        0,
-        4,
-        2,
-        0,
-        5,
-        1,
-        3,
-        2,
-        4,
-        0,
-        3,
-        4,
-        5,
-        1,
-        3,
-        1,
-        2,
-        4,
-        5,
-    ],
-    5: [
-        5,
-        3,
-        2,
-        4,
-        1,
-        3,
-        2,
-        1,
-        0,
-        5,
-        2,
-        0,
-        4,
-        5,
-        3,
-        1,
-        0,
-        5,
-        3,
-        4,
-        2,
-        4,
-        1,
-        2,
-        0,
-    ],
-}
+# the wirings are only bound on first access, by the module's __getattr__, so
+# flake8 cannot see that they are defined
+__all__ = [  # noqa: F822
+    "SIXES",
+    "TWENTIES_I",
+    "TWENTIES_II",
+    "TWENTIES_III",
+    "SIZE",
+    "layers",
+    "forward",
+    "inverse",
+    "routes",
+]
 
-TWENTIES_I = {
-    6: [
-        11,
-        9,
-        22,
-        8,
-        24,
-        7,
-        21,
-        6,
-        22,
-        17,
-        25,
-        10,
-        20,
-        16,
-        17,
-        13,
-        12,
-        15,
-        18,
-        6,
-        14,
-        23,
-        21,
-        10,
-        19,
-    ],
-    7: [
-        24,
-        10,
-        6,
-        19,
-        11,
-        16,
-        12,
-        25,
-        14,
-        13,
-        6,
-        9,
-        22,
-        17,
-        21,
-        20,
-        8,
-        18,
-        12,
-        7,
-        25,
-        20,
-        23,
-        13,
-        15,
-    ],
-    8: [
-        19,
-        21,
-        18,
-        25,
-        13,
-        14,
-        11,
-        12,
-        16,
-        22,
-        21,
-        20,
-        15,
-        12,
-        7,
-        23,
-        10,
-        9,
-        14,
-        8,
-        17,
-        7,
-        24,
-        6,
-        9,
-    ],
-    9: [
-        6,
-        22,
-        11,
-        9,
-        25,
-        19,
-        23,
-        21,
-        13,
-        14,
-        16,
-        7,
-        24,
-        8,
-        12,
-        6,
-        23,
-        19,
-        17,
-        9,
-        10,
-        18,
-        15,
-        20,
-        13,
-    ],
-    10: [
-        15,
-        19,
-        20,
-        11,
-        18,
-        12,
-        14,
-        17,
-        25,
-        8,
-        7,
-        18,
-        21,
-        13,
-        9,
-        17,
-        22,
-        23,
-        25,
-        10,
-        15,
-        6,
-        16,
-        24,
-        14,
-    ],
-    11: [
-        9,
-        6,
-        16,
-        21,
-        10,
-        24,
-        15,
-        19,
-        23,
-        25,
-        22,
-        24,
-        7,
-        20,
-        13,
-        16,
-        18,
-        8,
-        21,
-        11,
-        22,
-        12,
-        25,
-        14,
-        17,
-    ],
-    12: [
-        7,
-        25,
-        24,
-        13,
-        23,
-        11,
-        18,
-        10,
-        12,
-        9,
-        14,
-        11,
-        16,
-        21,
-        20,
-        22,
-        24,
-        7,
-        19,
-        12,
-        6,
-        15,
-        10,
-        17,
-        8,
-    ],
-    13: [
-        12,
-        20,
-        17,
-        24,
-        9,
-        8,
-        6,
-        23,
-        19,
-        15,
-        9,
-        21,
-        13,
-        11,
-        24,
-        19,
-        25,
-        22,
-        15,
-        13,
-        18,
-        10,
-        14,
-        7,
-        16,
-    ],
-    14: [
-        18,
-        8,
-        21,
-        7,
-        15,
-        23,
-        22,
-        20,
-        6,
-        19,
-        13,
-        17,
-        14,
-        9,
-        10,
-        25,
-        19,
-        16,
-        24,
-        14,
-        12,
-        24,
-        6,
-        11,
-        22,
-    ],
-    15: [
-        14,
-        13,
-        23,
-        17,
-        8,
-        18,
-        7,
-        15,
-        21,
-        10,
-        20,
-        19,
-        12,
-        25,
-        6,
-        21,
-        16,
-        24,
-        11,
-        15,
-        20,
-        22,
-        9,
-        8,
-        25,
-    ],
-    16: [
-        13,
-        23,
-        15,
-        22,
-        21,
-        17,
-        10,
-        18,
-        20,
-        12,
-        15,
-        13,
-        8,
-        7,
-        16,
-        18,
-        14,
-        25,
-        6,
-        16,
-        9,
-        11,
-        17,
-        19,
-        24,
-    ],
-    17: [
-        21,
-        16,
-        8,
-        14,
-        20,
-        13,
-        9,
-        11,
-        10,
-        23,
-        18,
-        12,
-        19,
-        10,
-        14,
-        24,
-        15,
-        6,
-        7,
-        17,
-        8,
-        25,
-        18,
-        22,
-        11,
-    ],
-    18: [
-        8,
-        17,
-        12,
-        10,
-        19,
-        15,
-        16,
-        13,
-        24,
-        7,
-        8,
-        22,
-        23,
-        6,
-        25,
-        14,
-        7,
-        11,
-        16,
-        18,
-        21,
-        14,
-        12,
-        9,
-        20,
-    ],
-    19: [
-        23,
-        18,
-        19,
-        6,
-        17,
-        20,
-        24,
-        8,
-        7,
-        21,
-        23,
-        15,
-        18,
-        14,
-        22,
-        12,
-        11,
-        17,
-        9,
-        19,
-        13,
-        16,
-        11,
-        25,
-        10,
-    ],
-    20: [
-        20,
-        15,
-        13,
-        16,
-        12,
-        21,
-        25,
-        9,
-        11,
-        18,
-        19,
-        23,
-        17,
-        24,
-        11,
-        8,
-        6,
-        14,
-        10,
-        20,
-        23,
-        17,
-        22,
-        21,
-        7,
-    ],
-    21: [
-        16,
-        24,
-        25,
-        15,
-        7,
-        22,
-        19,
-        14,
-        17,
-        11,
-        10,
-        8,
-        6,
-        23,
-        19,
-        9,
-        20,
-        12,
-        8,
-        21,
-        16,
-        13,
-        7,
-        18,
-        23,
-    ],
-    22: [
-        10,
-        7,
-        9,
-        12,
-        22,
-        25,
-        13,
-        16,
-        9,
-        6,
-        11,
-        14,
-        10,
-        15,
-        18,
-        7,
-        17,
-        20,
-        23,
-        22,
-        24,
-        8,
-        19,
-        23,
-        21,
-    ],
-    23: [
-        17,
-        11,
-        14,
-        18,
-        16,
-        9,
-        20,
-        22,
-        15,
-        24,
-        12,
-        6,
-        25,
-        19,
-        8,
-        10,
-        21,
-        13,
-        22,
-        23,
-        7,
-        9,
-        20,
-        15,
-        12,
-    ],
-    24: [
-        25,
-        14,
-        7,
-        20,
-        6,
-        10,
-        8,
-        24,
-        18,
-        20,
-        17,
-        16,
-        11,
-        22,
-        23,
-        15,
-        9,
-        10,
-        13,
-        24,
-        19,
-        21,
-        8,
-        12,
-        6,
-    ],
-    25: [
-        22,
-        12,
-        10,
-        23,
-        14,
-        6,
-        17,
-        7,
-        8,
-        16,
-        24,
-        25,
-        9,
-        18,
-        15,
-        11,
-        13,
-        21,
-        20,
-        25,
-        11,
-        19,
-        13,
-        16,
-        18,
-    ],
-}
+# the number of positions of each of the stepping switches
+SIZE = 25
 
-TWENTIES_II = {
-    6: [
-        20,
-        17,
-        9,
-        11,
-        12,
-        10,
-        13,
-        25,
-        14,
-        15,
-        16,
-        7,
-        21,
-        24,
-        23,
-        25,
-        8,
-        10,
-        19,
-        13,
-        22,
-        6,
-        21,
-        24,
-        18,
-    ],
-    7: [
-        14,
-        11,
-        23,
-        16,
-        7,
-        22,
-        9,
-        6,
-        13,
-        17,
-        12,
-        8,
-        15,
-        21,
-        19,
-        8,
-        11,
-        20,
-        25,
-        16,
-        24,
-        10,
-        13,
-        18,
-        6,
-    ],
-    8: [
-        6,
-        20,
-        10,
-        7,
-        18,
-        19,
-        8,
-        21,
-        12,
-        16,
-        19,
-        14,
-        20,
-        23,
-        17,
-        24,
-        9,
-        25,
-        18,
-        6,
-        11,
-        17,
-        15,
-        13,
-        22,
-    ],
-    9: [
-        10,
-        7,
-        13,
-        25,
-        8,
-        12,
-        16,
-        15,
-        20,
-        23,
-        9,
-        15,
-        6,
-        17,
-        24,
-        7,
-        19,
-        14,
-        22,
-        11,
-        6,
-        25,
-        18,
-        21,
-        20,
-    ],
-    10: [
-        22,
-        9,
-        21,
-        19,
-        14,
-        15,
-        24,
-        20,
-        10,
-        13,
-        23,
-        18,
-        22,
-        8,
-        6,
-        9,
-        7,
-        15,
-        10,
-        24,
-        17,
-        11,
-        16,
-        25,
-        12,
-    ],
-    11: [
-        24,
-        14,
-        6,
-        12,
-        9,
-        14,
-        18,
-        13,
-        7,
-        21,
-        25,
-        19,
-        8,
-        18,
-        12,
-        10,
-        17,
-        22,
-        23,
-        19,
-        20,
-        16,
-        11,
-        15,
-        9,
-    ],
-    12: [
-        8,
-        13,
-        17,
-        23,
-        22,
-        24,
-        7,
-        19,
-        9,
-        25,
-        11,
-        20,
-        18,
-        14,
-        15,
-        16,
-        21,
-        6,
-        13,
-        10,
-        25,
-        19,
-        24,
-        12,
-        21,
-    ],
-    13: [
-        7,
-        21,
-        20,
-        17,
-        19,
-        25,
-        14,
-        16,
-        18,
-        22,
-        6,
-        21,
-        14,
-        15,
-        11,
-        19,
-        10,
-        24,
-        9,
-        23,
-        12,
-        13,
-        10,
-        6,
-        8,
-    ],
-    14: [
-        15,
-        24,
-        25,
-        20,
-        6,
-        13,
-        17,
-        23,
-        22,
-        10,
-        18,
-        12,
-        9,
-        11,
-        16,
-        14,
-        23,
-        18,
-        7,
-        22,
-        21,
-        14,
-        8,
-        7,
-        19,
-    ],
-    15: [
-        13,
-        22,
-        19,
-        8,
-        17,
-        18,
-        21,
-        10,
-        6,
-        11,
-        24,
-        16,
-        12,
-        7,
-        20,
-        15,
-        25,
-        17,
-        20,
-        8,
-        14,
-        12,
-        9,
-        23,
-        10,
-    ],
-    16: [
-        16,
-        10,
-        18,
-        13,
-        23,
-        6,
-        15,
-        8,
-        16,
-        14,
-        17,
-        25,
-        11,
-        22,
-        10,
-        23,
-        12,
-        9,
-        21,
-        15,
-        8,
-        24,
-        20,
-        19,
-        7,
-    ],
-    17: [
-        23,
-        16,
-        22,
-        10,
-        25,
-        7,
-        22,
-        12,
-        11,
-        8,
-        20,
-        17,
-        13,
-        19,
-        14,
-        21,
-        24,
-        7,
-        6,
-        18,
-        16,
-        9,
-        25,
-        11,
-        15,
-    ],
-    18: [
-        17,
-        25,
-        16,
-        15,
-        11,
-        21,
-        19,
-        18,
-        24,
-        9,
-        10,
-        23,
-        7,
-        16,
-        13,
-        20,
-        6,
-        12,
-        14,
-        17,
-        18,
-        8,
-        22,
-        14,
-        23,
-    ],
-    19: [
-        21,
-        12,
-        7,
-        6,
-        16,
-        8,
-        20,
-        22,
-        23,
-        24,
-        14,
-        11,
-        19,
-        9,
-        25,
-        17,
-        20,
-        11,
-        24,
-        25,
-        15,
-        18,
-        7,
-        10,
-        13,
-    ],
-    20: [
-        11,
-        15,
-        12,
-        22,
-        21,
-        9,
-        25,
-        24,
-        19,
-        18,
-        21,
-        6,
-        10,
-        12,
-        22,
-        13,
-        14,
-        16,
-        8,
-        20,
-        7,
-        15,
-        23,
-        17,
-        16,
-    ],
-    21: [
-        18,
-        23,
-        14,
-        24,
-        20,
-        17,
-        11,
-        9,
-        15,
-        12,
-        7,
-        10,
-        16,
-        25,
-        9,
-        12,
-        13,
-        19,
-        11,
-        21,
-        23,
-        22,
-        6,
-        8,
-        14,
-    ],
-    22: [
-        25,
-        6,
-        11,
-        14,
-        10,
-        16,
-        23,
-        7,
-        8,
-        6,
-        22,
-        13,
-        17,
-        20,
-        8,
-        18,
-        15,
-        21,
-        12,
-        9,
-        13,
-        23,
-        19,
-        22,
-        24,
-    ],
-    23: [
-        9,
-        19,
-        8,
-        21,
-        13,
-        23,
-        6,
-        14,
-        25,
-        19,
-        15,
-        22,
-        24,
-        10,
-        18,
-        11,
-        16,
-        13,
-        15,
-        7,
-        9,
-        21,
-        12,
-        20,
-        17,
-    ],
-    24: [
-        19,
-        18,
-        15,
-        9,
-        24,
-        11,
-        12,
-        17,
-        21,
-        20,
-        13,
-        24,
-        23,
-        6,
-        7,
-        22,
-        18,
-        8,
-        17,
-        12,
-        10,
-        20,
-        14,
-        16,
-        25,
-    ],
-    25: [
-        12,
-        8,
-        24,
-        18,
-        15,
-        20,
-        10,
-        11,
-        17,
-        7,
-        8,
-        9,
-        25,
-        13,
-        21,
-        6,
-        22,
-        23,
-        16,
-        14,
-        19,
-        7,
-        17,
-        9,
-        11,
-    ],
+# the input letters of each stepping switch, and their packed wiring
+_PACKED = {
+    "SIXES": (
+        range(0, 6),
+        bytes.fromhex(
+            "01050003020105020403010402030004050100020500050304"  # 0
+            "00020402050004050304000300010503010201000402030501"  # 1
+            "02040301000503000102030501040102040302050005040003"  # 2
+            "04010500030401030501040205000205020004030103000102"  # 3
+            "03000105040200040200050103020400030405010301020405"  # 4
+            "05030204010302010005020004050301000503040204010200"  # 5
+        ),
+    ),
+    "TWENTIES_I": (
+        range(6, 26),
+        bytes.fromhex(
+            "0b091608180715061611190a1410110d0c0f12060e17150a13"  # 6
+            "180a06130b100c190e0d06091611151408120c071914170d0f"  # 7
+            "131512190d0e0b0c101615140f0c07170a090e081107180609"  # 8
+            "06160b09191317150d0e100718080c06171311090a120f140d"  # 9
+            "0f13140b120c0e1119080712150d09111617190a0f0610180e"  # 10
+            "090610150a180f131719161807140d101208150b160c190e11"  # 11
+            "0719180d170b120a0c090e0b101514161807130c060f0a1108"  # 12
+            "0c14111809080617130f09150d0b181319160f0d120a0e0710"  # 13
+            "120815070f17161406130d110e090a191310180e0c18060b16"  # 14
+            "0e0d17110812070f150a14130c19061510180b0f1416090819"  # 15
+            "0d170f1615110a12140c0f0d080710120e190610090b111318"  # 16
+            "1510080e140d090b0a17120c130a0e180f060711081912160b"  # 17
+            "08110c0a130f100d180708161706190e070b1012150e0c0914"  # 18
+            "17121306111418080715170f120e160c0b1109130d100b190a"  # 19
+            "140f0d100c1519090b12131711180b08060e0a141711161507"  # 20
+            "1018190f0716130e110b0a0806171309140c0815100d071217"  # 21
+            "0a07090c16190d1009060b0e0a0f1207111417161808131715"  # 22
+            "110b0e12100914160f180c061913080a150d16170709140f0c"  # 23
+            "190e0714060a0818121411100b16170f090a0d181315080c06"  # 24
+            "160c0a170e0611070810181909120f0b0d1514190b130d1012"  # 25
+        ),
+    ),
+    "TWENTIES_II": (
+        range(6, 26),
+        bytes.fromhex(
+            "1411090b0c0a0d190e0f100715181719080a130d1606151812"  # 6
+            "0e0b1710071609060d110c080f1513080b141910180a0d1206"  # 7
+            "06140a07121308150c10130e14171118091912060b110f0d16"  # 8
+            "0a070d19080c100f1417090f06111807130e160b0619121514"  # 9
+            "160915130e0f18140a0d171216080609070f0a18110b10190c"  # 10
+            "180e060c090e120d0715191308120c0a1116171314100b0f09"  # 11
+            "080d11171618071309190b14120e0f1015060d0a1913180c15"  # 12
+            "0715141113190e10121606150e0f0b130a1809170c0d0a0608"  # 13
+            "0f181914060d1117160a120c090b100e17120716150e080713"  # 14
+            "0d1613081112150a060b18100c07140f191114080e0c09170a"  # 15
+            "100a120d17060f08100e11190b160a170c09150f0818141307"  # 16
+            "1710160a1907160c0b0814110d130e15180706121009190b0f"  # 17
+            "1119100f0b15131218090a1707100d14060c0e111208160e17"  # 18
+            "150c07061008141617180e0b13091911140b18190f12070a0d"  # 19
+            "0b0f0c1615091918131215060a0c160d0e100814070f171110"  # 20
+            "12170e1814110b090f0c070a1019090c0d130b15171606080e"  # 21
+            "19060b0e0a1017070806160d111408120f150c090d17131618"  # 22
+            "091308150d17060e19130f16180a120b100d0f0709150c1411"  # 23
+            "13120f09180b0c1115140d18170607161208110c0a140e1019"  # 24
+            "0c0818120f140a0b11070809190d15061617100e130711090b"  # 25
+        ),
+    ),
+    "TWENTIES_III": (
+        range(6, 26),
+        bytes.fromhex(
+            "0c1407151112090e0a101806080e0d1713160f1910150b0d12"  # 6
+            "18161008170e0c0b13150d11091012150618140e190a0f0c07"  # 7
+            "10131911150a0709170e08160f0b13140c06070d120f180a16"  # 8
+            "0807110e090b140f16171412110a15091910130b0d1815060c"  # 9
+            "191106090e0d16171208130e060f18070b0c101115090a1413"  # 10
+            "06121819080c0f1514110a0c1709111612070b100f170e130d"  # 11
+            "0f0d090b1411180d100a06130716191215170c071714060e08"  # 12
+            "0b080f1812160a13111410070d180c111709060a131619150e"  # 13
+            "15060e170b130d0a0c0f071413120f0b110815091806161019"  # 14
+            "11181307191715110d060f09121408100e0d190c0b0809160a"  # 15
+            "160e0b0a0d1906160813110a180c1419090f12151407101715"  # 16
+            "1209140d070f11060b1615100c070e18160a08130919170b0f"  # 17
+            "0d0f12130c0708190607170b151109130a140e1606100c180b"  # 18
+            "0e0c08100f181214070919150b17160a10110d08160b131906"  # 19
+            "09100c0f0a100b12191816081413060e071517140c0d120811"  # 20
+            "1719150618141318090b0c0d0e191006080e160f0a12071114"  # 21
+            "0a151714130919070e0d121716060a0d0f0b1812080c110910"  # 22
+            "130b0d1606080e100f0c09181915070c14120a180e110d0717"  # 23
+            "14170a121606100c15120e190a0d0b08181911170713080f09"  # 24
+            "070a160c1015170818190b0f1008170f0d130906110e141218"  # 25
+        ),
+    ),
 }
 
-TWENTIES_III = {
-    6: [
-        12,
-        20,
-        7,
-        21,
-        17,
-        18,
-        9,
-        14,
-        10,
-        16,
-        24,
-        6,
-        8,
-        14,
-        13,
-        23,
-        19,
-        22,
-        15,
-        25,
-        16,
-        21,
-        11,
-        13,
-        18,
-    ],
-    7: [
-        24,
-        22,
-        16,
-        8,
-        23,
-        14,
-        12,
-        11,
-        19,
-        21,
-        13,
-        17,
-        9,
-        16,
-        18,
-        21,
-        6,
-        24,
-        20,
-        14,
-        25,
-        10,
-        15,
-        12,
-        7,
-    ],
-    8: [
-        16,
-        19,
-        25,
-        17,
-        21,
-        10,
-        7,
-        9,
-        23,
-        14,
-        8,
-        22,
-        15,
-        11,
-        19,
-        20,
-        12,
-        6,
-        7,
-        13,
-        18,
-        15,
-        24,
-        10,
-        22,
-    ],
-    9: [
-        8,
-        7,
-        17,
-        14,
-        9,
-        11,
-        20,
-        15,
-        22,
-        23,
-        20,
-        18,
-        17,
-        10,
-        21,
-        9,
-        25,
-        16,
-        19,
-        11,
-        13,
-        24,
-        21,
-        6,
-        12,
-    ],
-    10: [
-        25,
-        17,
-        6,
-        9,
-        14,
-        13,
-        22,
-        23,
-        18,
-        8,
-        19,
-        14,
-        6,
-        15,
-        24,
-        7,
-        11,
-        12,
-        16,
-        17,
-        21,
-        9,
-        10,
-        20,
-        19,
-    ],
-    11: [
-        6,
-        18,
-        24,
-        25,
-        8,
-        12,
-        15,
-        21,
-        20,
-        17,
-        10,
-        12,
-        23,
-        9,
-        17,
-        22,
-        18,
-        7,
-        11,
-        16,
-        15,
-        23,
-        14,
-        19,
-        13,
-    ],
-    12: [
-        15,
-        13,
-        9,
-        11,
-        20,
-        17,
-        24,
-        13,
-        16,
-        10,
-        6,
-        19,
-        7,
-        22,
-        25,
-        18,
-        21,
-        23,
-        12,
-        7,
-        23,
-        20,
-        6,
-        14,
-        8,
-    ],
-    13: [
-        11,
-        8,
-        15,
-        24,
-        18,
-        22,
-        10,
-        19,
-        17,
-        20,
-        16,
-        7,
-        13,
-        24,
-        12,
-        17,
-        23,
-        9,
-        6,
-        10,
-        19,
-        22,
-        25,
-        21,
-        14,
-    ],
-    14: [
-        21,
-        6,
-        14,
-        23,
-        11,
-        19,
-        13,
-        10,
-        12,
-        15,
-        7,
-        20,
-        19,
-        18,
-        15,
-        11,
-        17,
-        8,
-        21,
-        9,
-        24,
-        6,
-        22,
-        16,
-        25,
-    ],
-    15: [
-        17,
-        24,
-        19,
-        7,
-        25,
-        23,
-        21,
-        17,
-        13,
-        6,
-        15,
-        9,
-        18,
-        20,
-        8,
-        16,
-        14,
-        13,
-        25,
-        12,
-        11,
-        8,
-        9,
-        22,
-        10,
-    ],
-    16: [
-        22,
-        14,
-        11,
-        10,
-        13,
-        25,
-        6,
-        22,
-        8,
-        19,
-        17,
-        10,
-        24,
-        12,
-        20,
-        25,
-        9,
-        15,
-        18,
-        21,
-        20,
-        7,
-        16,
-        23,
-        21,
-    ],
-    17: [
-        18,
-        9,
-        20,
-        13,
-        7,
-        15,
-        17,
-        6,
-        11,
-        22,
-        21,
-        16,
-        12,
-        7,
-        14,
-        24,
-        22,
-        10,
-        8,
-        19,
-        9,
-        25,
-        23,
-        11,
-        15,
-    ],
-    18: [
-        13,
-        15,
-        18,
-        19,
-        12,
-        7,
-        8,
-        25,
-        6,
-        7,
-        23,
-        11,
-        21,
-        17,
-        9,
-        19,
-        10,
-        20,
-        14,
-        22,
-        6,
-        16,
-        12,
-        24,
-        11,
-    ],
-    19: [
-        14,
-        12,
-        8,
-        16,
-        15,
-        24,
-        18,
-        20,
-        7,
-        9,
-        25,
-        21,
-        11,
-        23,
-        22,
-        10,
-        16,
-        17,
-        13,
-        8,
-        22,
-        11,
-        19,
-        25,
-        6,
-    ],
-    20: [
-        9,
-        16,
-        12,
-        15,
-        10,
-        16,
-        11,
-        18,
-        25,
-        24,
-        22,
-        8,
-        20,
-        19,
-        6,
-        14,
-        7,
-        21,
-        23,
-        20,
-        12,
-        13,
-        18,
-        8,
-        17,
-    ],
-    21: [
-        23,
-        25,
-        21,
-        6,
-        24,
-        20,
-        19,
-        24,
-        9,
-        11,
-        12,
-        13,
-        14,
-        25,
-        16,
-        6,
-        8,
-        14,
-        22,
-        15,
-        10,
-        18,
-        7,
-        17,
-        20,
-    ],
-    22: [
-        10,
-        21,
-        23,
-        20,
-        19,
-        9,
-        25,
-        7,
-        14,
-        13,
-        18,
-        23,
-        22,
-        6,
-        10,
-        13,
-        15,
-        11,
-        24,
-        18,
-        8,
-        12,
-        17,
-        9,
-        16,
-    ],
-    23: [
-        19,
-        11,
-        13,
-        22,
-        6,
-        8,
-        14,
-        16,
-        15,
-        12,
-        9,
-        24,
-        25,
-        21,
-        7,
-        12,
-        20,
-        18,
-        10,
-        24,
-        14,
-        17,
-        13,
-        7,
-        23,
-    ],
-    24: [
-        20,
-        23,
-        10,
-        18,
-        22,
-        6,
-        16,
-        12,
-        21,
-        18,
-        14,
-        25,
-        10,
-        13,
-        11,
-        8,
-        24,
-        25,
-        17,
-        23,
-        7,
-        19,
-        8,
-        15,
-        9,
-    ],
-    25: [
-        7,
-        10,
-        22,
-        12,
-        16,
-        21,
-        23,
-        8,
-        24,
-        25,
-        11,
-        15,
-        16,
-        8,
-        23,
-        15,
-        13,
-        19,
-        9,
-        6,
-        17,
-        14,
-        20,
-        18,
-        24,
-    ],
-}
+
+def layers(name):
+    """ Return the range of input letters of the named stepping switch. """
+
+    return _PACKED[name][0]
+
+
+@functools.lru_cache(maxsize=None)
+def forward(name):
+    """Return the wiring of the named stepping switch as a position-major
+    lookup table, such that the output for input `n` at position `p` is
+
+        forward(name)[p * len(layers(name)) + n - layers(name).start]
+
+    """
+
+    _, packed = _PACKED[name]
+
+    # the packed form is input-major, so that each column is a position
+    return b"".join(packed[p::SIZE] for p in range(SIZE))
+
+
+@functools.lru_cache(maxsize=None)
+def inverse(name):
+    """Return the inverse wiring of the named stepping switch as a
+    position-major lookup table, such that the input which is routed to output
+    `n` at position `p` is
+
+        inverse(name)[p * len(layers(name)) + n - layers(name).start]
+
+    """
+
+    inputs, _ = _PACKED[name]
+    forward_ = forward(name)
+    width = len(inputs)
+
+    # invert each position's substitution by translating the inputs through
+    # the table which maps each output back to its input
+    letters = bytes(inputs)
+    return b"".join(
+        letters.translate(
+            bytes.maketrans(forward_[p * width : (p + 1) * width], letters)
+        )
+        for p in range(SIZE)
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def routes(name):
+    """Return the routing of the named stepping switch at each position, as a
+    pair `(forward, inverse)` of tuples, each holding one `bytes` object per
+    position. The objects are padded so that they are indexed by the input
+    letter; e.g. the output for input `n` at position `p` is
+
+        routes(name)[0][p][n]
+
+    The tables are built once, and shared by every switch with this wiring.
+    """
+
+    inputs = layers(name)
+    width, pad = len(inputs), bytes(inputs.start)
+
+    return tuple(
+        tuple(pad + table[p * width : (p + 1) * width] for p in range(SIZE))
+        for table in [forward(name), inverse(name)]
+    )
+
+
+def __getattr__(name):
+    """ Unpack the dictionary form of the named wiring on first access. """
+
+    if name not in _PACKED:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    inputs, packed = _PACKED[name]
+    routing_logic = {
+        n: list(packed[i * SIZE : (i + 1) * SIZE])
+        for i, n in enumerate(inputs)
+    }
+
+    # cache the dictionary, so that this is not called again
+    globals()[name] = routing_logic
+
+    return routing_logic
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_PACKED))
@@ -12,62 +12,234 @@
 """
 import string
 
-import system97.logic
+import system97.plugboard
 import system97.switch
 
 
+def count_steps(sixes, medium, n):
+    """Return the number of times that each of the fast, medium and slow
+    switches step over the course of `n` steps, given the starting positions of
+    the sixes and medium switches.
+
+    The sixes switch visits position 24 once every 25 steps, and the medium
+    switch steps on each of those visits. The slow switch steps on visits to
+    position 23 of the sixes, but only those during which the medium switch is
+    at position 24; as the medium switch steps exactly once between any two
+    such visits, this happens on every 25th visit. The fast switch steps
+    otherwise.
+
+    This is computed in closed form, and so `n` may equally be an integer or
+    an array of integers.
+    """
+
+    medium_ = (sixes + n) // 25
+
+    # count the visits to position 23, and find the first such visit during
+    # which the medium switch is at position 24
+    visits = (sixes + n + 1) // 25 - (sixes + 1) // 25
+    first = (24 - medium - (sixes == 24)) % 25
+    slow_ = (visits + 24 - first) // 25
+
+    return n - medium_ - slow_, medium_, slow_
+
+
+def buffers(src, dst):
+    """Return byte-oriented views of the supplied source and destination
+    buffers, checking that the destination is large enough to hold the output.
+    """
+
+    src = memoryview(src).cast("B")
+    dst = memoryview(dst).cast("B")
+
+    if dst.readonly:
+        raise TypeError("destination buffer is read-only")
+    if len(dst) < len(src):
+        raise ValueError(
+            f"destination buffer is too small ({len(dst)} < {len(src)})"
+        )
+
+    return src, dst
+
+
 class System97:
     """This class implements a historically accurate simulator of the
     "System 97" or Type-B Cipher Machine.
 
     """
 
+    __slots__ = (
+        "sixes",
+        "twenties",
+        "fast",
+        "medium",
+        "slow",
+        "plugboard",
+        "positions",
+    )
+
     CHARSET = set(string.ascii_uppercase)
 
-    def decrypt(self, ciphertext):
-        """ Decrypts the given ciphertext and returns the plaintext output. """
+    def _translate(self, text, encrypt):
+        """Feed the supplied text through the machine, in the direction given
+        by `encrypt`.
+        """
+
+        data = text.encode("ascii")
+        output = bytearray(len(data))
+        self._translate_into(memoryview(data), memoryview(output), encrypt)
+
+        return output.decode("ascii")
 
-        plaintext = []
-        for c in ciphertext:
-            if c in ["-", "/", " "]:
-                # illegible in the transcription
-                plaintext.append(c)
-            else:
-                n = self.plugboard.index(c)
-                if n < 6:
-                    x = self.sixes.decrypt(n)
-                else:
-                    x = self.twenties[1].decrypt(
-                        self.twenties[2].decrypt(self.twenties[3].decrypt(n))
-                    )
-
-                plaintext.append(self.plugboard[x])
+    def _translate_into(self, src, dst, encrypt):
+        """Feed the contents of the buffer `src` through the machine, in the
+        direction given by `encrypt`, writing the output into the buffer `dst`.
+
+        The input is translated through the plugboard all at once, each signal
+        is routed through the switches in turn, and the output is translated
+        back through the plugboard all at once.
+        """
+
+        if encrypt:
+            sixes, twenties = self.sixes.inverse, self.encrypt_twenties
+        else:
+            sixes, twenties = self.sixes.forward, self.decrypt_twenties
+
+        data = self.plugboard.encode(src)
+
+        x = bytearray(data)
+        for k, n in enumerate(data):
+            if n < 6:
+                x[k] = sixes[self.sixes.position][n]
+            elif n < 26:
+                x[k] = twenties(n)
 
             self.step()
 
-        return "".join(plaintext)
+        dst[: len(x)] = x.translate(self.plugboard.reverse)
+
+    def decrypt(self, ciphertext):
+        """ Decrypts the given ciphertext and returns the plaintext output. """
+
+        return self._translate(ciphertext, False)
 
     def encrypt(self, plaintext):
         """ Encrypts the given plaintext and returns the ciphertext output. """
 
-        ciphertext = []
-        for c in plaintext:
-            if c in ["-", "/", " "]:
-                ciphertext.append(c)
-            else:
-                n = self.plugboard.index(c)
-                if n < 6:
-                    x = self.sixes.encrypt(n)
-                else:
-                    x = self.twenties[3].encrypt(
-                        self.twenties[2].encrypt(self.twenties[1].encrypt(n))
-                    )
-
-                ciphertext.append(self.plugboard[x])
+        return self._translate(plaintext, True)
 
-            self.step()
+    def decrypt_into(self, src, dst):
+        """Decrypts the ciphertext in the buffer `src`, which may be any object
+        supporting the buffer protocol, into the writable buffer `dst`, and
+        returns the number of bytes written.
+        """
+
+        src, dst = buffers(src, dst)
+        self._translate_into(src, dst, False)
+
+        return len(src)
+
+    def encrypt_into(self, src, dst):
+        """Encrypts the plaintext in the buffer `src`, which may be any object
+        supporting the buffer protocol, into the writable buffer `dst`, and
+        returns the number of bytes written.
+        """
+
+        src, dst = buffers(src, dst)
+        self._translate_into(src, dst, True)
+
+        return len(src)
+
+    def decrypt_bytes(self, ciphertext):
+        """ Decrypts the given ciphertext bytes and returns the plaintext. """
+
+        output = bytearray(memoryview(ciphertext).nbytes)
+        self.decrypt_into(ciphertext, output)
+
+        return bytes(output)
+
+    def encrypt_bytes(self, plaintext):
+        """ Encrypts the given plaintext bytes and returns the ciphertext. """
+
+        output = bytearray(memoryview(plaintext).nbytes)
+        self.encrypt_into(plaintext, output)
+
+        return bytes(output)
+
+    def decrypt_iter(self, chunks):
+        """Decrypts each of the given chunks of ciphertext in turn, yielding
+        the plaintext output of each.
+
+        The machine carries its state from one chunk to the next, so the
+        concatenated output is identical to that of `System97.decrypt` on the
+        concatenated input, but only one chunk is ever held in memory.
+        """
+
+        for chunk in chunks:
+            yield self.decrypt(chunk)
+
+    def encrypt_iter(self, chunks):
+        """Encrypts each of the given chunks of plaintext in turn, yielding
+        the ciphertext output of each.
+
+        The machine carries its state from one chunk to the next, so the
+        concatenated output is identical to that of `System97.encrypt` on the
+        concatenated input, but only one chunk is ever held in memory.
+        """
+
+        for chunk in chunks:
+            yield self.encrypt(chunk)
+
+    def sixes_stream(self, text, encrypt=False):
+        """Decrypts (or, if `encrypt` is set, encrypts) only the sixes letters
+        of the supplied text, replacing each of the twenties letters with a
+        dash, and advances the machine past the text.
+
+        As the sixes switch steps on every character, the substitution applied
+        to the sixes letters repeats every 25 characters, independently of the
+        twenties switches. Rather than stepping the machine, each of the 25
+        residue classes of the text is therefore translated at once.
+        """
+
+        routing = self.sixes.inverse if encrypt else self.sixes.forward
+        size = self.sixes.size
+
+        data = text.encode("ascii")
+        output = bytearray(len(data))
+        for r in range(min(size, len(data))):
+            # characters which are not wired into the plugboard are mapped to
+            # zero, and rejected below
+            table = bytearray(256)
+            for c in ["-", "/", " "]:
+                table[ord(c)] = ord(c)
+            for c in self.plugboard:
+                table[ord(c)] = ord("-")
+            route = routing[(self.sixes.position + r) % size]
+            for n in range(6):
+                table[ord(self.plugboard[n])] = ord(self.plugboard[route[n]])
+
+            output[r::size] = data[r::size].translate(table)
+
+        if 0 in output:
+            c = text[output.index(0)]
+            raise ValueError(f"{c!r} is not wired into the plugboard")
+
+        self.advance(len(data))
+
+        return output.decode("ascii")
 
-        return "".join(ciphertext)
+    def decrypt_twenties(self, n):
+        """ Route the supplied signal forwards through the twenties. """
+
+        return self.twenties[1].decrypt(
+            self.twenties[2].decrypt(self.twenties[3].decrypt(n))
+        )
+
+    def encrypt_twenties(self, n):
+        """ Route the supplied signal backwards through the twenties. """
+
+        return self.twenties[3].encrypt(
+            self.twenties[2].encrypt(self.twenties[1].encrypt(n))
+        )
 
     def step(self):
         """Step the stepping switches.
@@ -94,6 +266,113 @@ class System97:
 
         self.sixes.step()
 
+    def unstep(self):
+        """Step the stepping switches backwards, undoing System97.step.
+
+        The sixes switch always steps back. The switch which stepped forwards
+        is then determined by applying the rules in System97.step to the
+        positions that the switches were in beforehand; the medium-speed
+        switch cannot have moved if the sixes switch was at position 23, so
+        its current position can be used in its place.
+        """
+
+        self.sixes.unstep()
+
+        if (self.sixes.position == 23) and (self.medium.position == 24):
+            self.slow.unstep()
+        elif self.sixes.position == 24:
+            self.medium.unstep()
+        else:
+            self.fast.unstep()
+
+    def advance(self, n):
+        """Step the stepping switches `n` times, in constant time.
+
+        This is equivalent to calling `System97.step` `n` times.
+        """
+
+        if n < 0:
+            raise ValueError(f"cannot advance by {n} steps")
+
+        fast, medium, slow = count_steps(
+            self.sixes.position, self.medium.position, n
+        )
+
+        self.fast.position = (self.fast.position + fast) % self.fast.size
+        self.medium.position = (
+            self.medium.position + medium
+        ) % self.medium.size
+        self.slow.position = (self.slow.position + slow) % self.slow.size
+        self.sixes.position = (self.sixes.position + n) % self.sixes.size
+
+    def reset(self, positions=None):
+        """Reset the stepping switches to their starting positions.
+
+        If `positions` are supplied, they replace the starting positions that
+        the machine was constructed with. This allows a single machine to be
+        reused across many messages which share the same speeds and plugboard.
+        """
+
+        if positions is not None:
+            switches = [self.sixes] + self.twenties[1:]
+            values = [positions[6]] + list(positions[20])
+            if any(
+                (value < 0) or (switch.size <= value)
+                for switch, value in zip(switches, values)
+            ):
+                raise ValueError(
+                    f"cannot set stepper arm positions to {positions}"
+                )
+
+            self.positions = {6: positions[6], 20: tuple(positions[20])}
+
+        self.sixes.position = self.positions[6]
+        for switch, position in zip(self.twenties[1:], self.positions[20]):
+            switch.position = position
+
+    def seek(self, n):
+        """Reset the stepping switches to their starting positions, and then
+        advance them to character offset `n`.
+        """
+
+        self.reset()
+        self.advance(n)
+
+    def snapshot(self):
+        """Return the state of the stepping switches as an immutable tuple of
+        the form `(sixes, I, II, III, speeds)`.
+
+        This can later be handed to System97.restore, which makes it cheap to
+        try several continuations from a common point without copying or
+        reconstructing the machine.
+        """
+
+        return (
+            self.sixes.position,
+            self.twenties[1].position,
+            self.twenties[2].position,
+            self.twenties[3].position,
+            (
+                self.twenties.index(self.fast),
+                self.twenties.index(self.medium),
+                self.twenties.index(self.slow),
+            ),
+        )
+
+    def restore(self, state):
+        """ Restore a state previously returned by System97.snapshot. """
+
+        sixes, i, ii, iii, speeds = state
+
+        self.sixes.position = sixes
+        self.twenties[1].position = i
+        self.twenties[2].position = ii
+        self.twenties[3].position = iii
+
+        self.fast = self.twenties[speeds[0]]
+        self.medium = self.twenties[speeds[1]]
+        self.slow = self.twenties[speeds[2]]
+
     def __init__(
         self,
         positions={6: 0, 20: (0, 0, 0)},
@@ -102,21 +381,13 @@ class System97:
     ):
 
         # initialize switches with the supplied starting positions
-        self.sixes = system97.switch.SteppingSwitch(
-            system97.logic.SIXES, positions[6]
-        )
+        self.sixes = system97.switch.SteppingSwitch("SIXES", positions[6])
         self.twenties = [
             None,  # so that the twenties are each indexed into the list by
             # their numerical value
-            system97.switch.SteppingSwitch(
-                system97.logic.TWENTIES_I, positions[20][0]
-            ),
-            system97.switch.SteppingSwitch(
-                system97.logic.TWENTIES_II, positions[20][1]
-            ),
-            system97.switch.SteppingSwitch(
-                system97.logic.TWENTIES_III, positions[20][2]
-            ),
+            system97.switch.SteppingSwitch("TWENTIES_I", positions[20][0]),
+            system97.switch.SteppingSwitch("TWENTIES_II", positions[20][1]),
+            system97.switch.SteppingSwitch("TWENTIES_III", positions[20][2]),
         ]
 
         # store references to the fast, middle, and slow switches
@@ -124,4 +395,12 @@ class System97:
         self.medium = self.twenties[speeds[1]]
         self.slow = self.twenties[speeds[2]]
 
-        self.plugboard = plugboard
+        # plugboards are immutable, and so can be shared between machines
+        if isinstance(plugboard, system97.plugboard.Plugboard):
+            self.plugboard = plugboard
+        else:
+            self.plugboard = system97.plugboard.Plugboard(plugboard)
+
+        # remember the starting positions, so that System97.seek is able to
+        # return to them
+        self.positions = {6: positions[6], 20: tuple(positions[20])}
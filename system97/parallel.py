@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# parallel.py
+# Copyright (c) 2020 Hugh Coleman
+#
+# This file is part of hughcoleman/system97, a historically accurate simulator
+# of the "System 97" or Type-B Cipher Machine. It is released under the MIT
+# License (see LICENSE.)
+""" Implements parallel encryption and decryption of long messages.
+
+As the positions of the stepping switches at any offset can be computed
+directly (see `System97.advance`), a long message can be split into shards
+which are each processed by a separate worker process, starting from the
+correct machine state, and the results concatenated.
+
+`settings` are the keyword arguments accepted by `System97`; that is, a
+dictionary with any of the keys `positions`, `speeds` and `plugboard`.
+
+Many short messages can also be processed as a batch. Messages which share the
+same speeds and plugboard are grouped together, and each group is handled by a
+single machine that is reset to the starting positions of each message in
+turn, rather than constructing a new machine for every message.
+
+Every function spreads its work across `workers` processes, which defaults to
+the number of available processors.
+"""
+import concurrent.futures
+import inspect
+import os
+
+import system97.engine
+import system97.machine
+
+
+def resolve_workers(workers):
+    """Return the number of worker processes to use, given the `workers`
+    argument of a function which spreads its work across processes; None
+    means one for each available processor.
+    """
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError(f"cannot use {workers} workers")
+
+    return workers
+
+
+def _translate(engine, settings, mode, offset, text):
+    """Encrypt or decrypt a shard of a message, which begins at the supplied
+    offset.
+    """
+
+    machine = engine(**settings)
+    machine.advance(offset)
+
+    return getattr(machine, mode)(text)
+
+
+def _parallel(mode, text, settings, workers, engine):
+    """Split the supplied text into shards, one per worker, and encrypt or
+    decrypt each of them in a separate process.
+    """
+
+    workers = resolve_workers(workers)
+
+    if (workers == 1) or (len(text) < workers):
+        return _translate(engine, settings, mode, 0, text)
+
+    size = -(-len(text) // workers)
+    offsets = range(0, len(text), size)
+
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        return "".join(
+            executor.map(
+                _translate,
+                [engine] * len(offsets),
+                [settings] * len(offsets),
+                [mode] * len(offsets),
+                offsets,
+                [text[offset : offset + size] for offset in offsets],
+            )
+        )
+
+
+def parallel_decrypt(
+    text, settings, workers=None, engine=system97.engine.CompiledSystem97
+):
+    """Decrypt the supplied ciphertext using `workers` processes, which
+    defaults to the number of available processors, and return the plaintext
+    output.
+
+    `engine` is the System97 class used by each of the workers.
+    """
+
+    return _parallel("decrypt", text, settings, workers, engine)
+
+
+def parallel_encrypt(
+    text, settings, workers=None, engine=system97.engine.CompiledSystem97
+):
+    """Encrypt the supplied plaintext using `workers` processes, which
+    defaults to the number of available processors, and return the ciphertext
+    output.
+
+    `engine` is the System97 class used by each of the workers.
+    """
+
+    return _parallel("encrypt", text, settings, workers, engine)
+
+
+# the settings that System97 uses for any which are not supplied
+DEFAULTS = {
+    name: parameter.default
+    for name, parameter in inspect.signature(
+        system97.machine.System97
+    ).parameters.items()
+}
+
+
+def _group(settings):
+    """Return the speeds and plugboard that a machine constructed with the
+    supplied settings uses, so that messages which omit a setting are grouped
+    with those which give its default, and plugboards with those which give
+    their wiring.
+    """
+
+    settings = dict(DEFAULTS, **settings)
+
+    return tuple(settings["speeds"]), str(settings["plugboard"])
+
+
+def _translate_group(engine, settings, mode, messages):
+    """Encrypt or decrypt a group of messages which share the same speeds and
+    plugboard, using a single machine.
+    """
+
+    machine = engine(**settings)
+    default = machine.positions
+
+    output = []
+    for positions, text in messages:
+        machine.reset(positions or default)
+        output.append(getattr(machine, mode)(text))
+
+    return output
+
+
+def _many(mode, messages, workers, engine):
+    """Group the supplied messages by their speeds and plugboard, encrypt or
+    decrypt each group, and return the results in input order.
+    """
+
+    workers = resolve_workers(workers)
+
+    groups = {}
+    for index, (settings, text) in enumerate(messages):
+        key = _group(settings)
+        if key not in groups:
+            groups[key] = (
+                {k: v for k, v in settings.items() if k != "positions"},
+                [],
+                [],
+            )
+
+        groups[key][1].append(index)
+        groups[key][2].append((settings.get("positions"), text))
+
+    groups = list(groups.values())
+    arguments = [
+        [engine] * len(groups),
+        [settings for settings, _, _ in groups],
+        [mode] * len(groups),
+        [group for _, _, group in groups],
+    ]
+
+    if (workers == 1) or (len(groups) == 1):
+        results = map(_translate_group, *arguments)
+    else:
+        with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+            results = list(executor.map(_translate_group, *arguments))
+
+    output = [None] * sum(len(indices) for _, indices, _ in groups)
+    for (_, indices, _), result in zip(groups, results):
+        for index, text in zip(indices, result):
+            output[index] = text
+
+    return output
+
+
+def decrypt_many(messages, workers=None, engine=system97.machine.System97):
+    """Decrypt each of the supplied `(settings, ciphertext)` pairs, and return
+    a list of the plaintext outputs in the same order.
+
+    The groups of messages are spread across `workers` processes, which
+    defaults to the number of available processors; pass 1 to handle every
+    group in this process.
+
+    `engine` is the System97 class used for each group. Batches of short
+    messages rarely recoup the cost of building the compiled twenties tables
+    (see `system97.engine.twenties`) in every process, so the plain System97
+    is used by default.
+    """
+
+    return _many("decrypt", messages, workers, engine)
+
+
+def encrypt_many(messages, workers=None, engine=system97.machine.System97):
+    """Encrypt each of the supplied `(settings, plaintext)` pairs, and return
+    a list of the ciphertext outputs in the same order.
+
+    The groups of messages are spread across `workers` processes, which
+    defaults to the number of available processors; pass 1 to handle every
+    group in this process.
+
+    `engine` is the System97 class used for each group. Batches of short
+    messages rarely recoup the cost of building the compiled twenties tables
+    (see `system97.engine.twenties`) in every process, so the plain System97
+    is used by default.
+    """
+
+    return _many("encrypt", messages, workers, engine)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# plugboard.py
+# Copyright (c) 2020 Hugh Coleman
+#
+# This file is part of hughcoleman/system97, a historically accurate simulator
+# of the "System 97" or Type-B Cipher Machine. It is released under the MIT
+# License (see LICENSE.)
+""" Implements the plugboard of the Type-B machine.
+
+The plugboard connects each of the 26 letters of the keyboard to one of the 26
+inputs of the stepping switches; the first six to the sixes switch, and the
+remaining twenty to the twenties switches. Its wiring is written as the letters
+in order of the input that they are connected to, e.g.
+
+    NOKTYUXEQLHBRMPDICJASVWGZF
+
+The characters which indicate an illegible letter in the transcription of a
+message (a dash, a slash or a space) are passed through unchanged.
+"""
+import string
+
+# the byte which invalid characters are mapped to by the lookup tables
+INVALID = 255
+
+
+class Plugboard:
+    """This class implements the plugboard of the Type-B machine.
+
+    In addition to behaving like its wiring string, a Plugboard carries a pair
+    of 256-entry lookup tables suitable for `bytes.translate`: `forward`, which
+    maps each letter to its input, and `reverse`, which maps each input back to
+    its letter. Both pass the illegible characters through unchanged, and map
+    any other byte to `INVALID`.
+
+    """
+
+    __slots__ = ("wiring", "indices", "forward", "reverse")
+
+    def encode(self, buffer):
+        """Translate the characters in the supplied buffer (any object
+        supporting the buffer protocol) to the inputs that they are connected
+        to, and return them as `bytes`. Illegible characters are passed
+        through unchanged.
+        """
+
+        buffer = bytes(buffer)
+        data = buffer.translate(self.forward)
+        if INVALID in data:
+            c = chr(buffer[data.index(INVALID)])
+            raise ValueError(f"{c!r} is not wired into the plugboard")
+
+        return data
+
+    def index(self, c):
+        """ Return the input that the supplied letter is connected to. """
+
+        try:
+            return self.indices[c]
+        except KeyError:
+            raise ValueError(f"{c!r} is not wired into the plugboard")
+
+    def __getitem__(self, n):
+        return self.wiring[n]
+
+    def __iter__(self):
+        return iter(self.wiring)
+
+    def __len__(self):
+        return len(self.wiring)
+
+    def __eq__(self, other):
+        if isinstance(other, Plugboard):
+            return self.wiring == other.wiring
+
+        return self.wiring == other
+
+    def __hash__(self):
+        return hash(self.wiring)
+
+    def __str__(self):
+        return self.wiring
+
+    def __repr__(self):
+        return f"Plugboard({self.wiring!r})"
+
+    def __init__(self, wiring):
+        """Construct a plugboard with the given wiring.
+
+        - `wiring` expects a string containing each of the letters A through Z
+          exactly once, or another Plugboard.
+
+        """
+
+        wiring = str(wiring)
+        if sorted(wiring) != list(string.ascii_uppercase):
+            raise ValueError(f"{wiring!r} is not a permutation of A-Z")
+
+        self.wiring = wiring
+        self.indices = {c: n for n, c in enumerate(wiring)}
+
+        forward = bytearray([INVALID] * 256)
+        reverse = bytearray([INVALID] * 256)
+        for c in ["-", "/", " "]:
+            forward[ord(c)] = reverse[ord(c)] = ord(c)
+        for n, c in enumerate(wiring):
+            forward[ord(c)] = n
+            reverse[n] = ord(c)
+
+        self.forward = bytes(forward)
+        self.reverse = bytes(reverse)
@@ -0,0 +1,266 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# scoring.py
+# Copyright (c) 2020 Hugh Coleman
+#
+# This file is part of hughcoleman/system97, a historically accurate simulator
+# of the "System 97" or Type-B Cipher Machine. It is released under the MIT
+# License (see LICENSE.)
+""" Implements n-gram language models for scoring candidate decryptions.
+
+The log-probabilities of the n-grams are stored in a dense array of 26 ** n
+entries, indexed by the base-26 code of the n-gram; e.g. the quadgram `TION`
+is found at index
+
+    ((T * 26 + I) * 26 + O) * 26 + N
+
+where A is 0, B is 1, and so on. N-grams which were never observed are given a
+`floor` log-probability. A text is scored by summing the log-probabilities of
+its n-grams, which is computed for a whole text (or batch of texts) at once
+as a sliding-window sum. N-grams which contain a character other than A
+through Z (such as an illegible character) also score the floor.
+
+Models can be read from the usual text format of one n-gram and its count per
+line, and saved to (and memory-mapped from) a compact binary format.
+
+This module requires NumPy, which can be installed alongside this package with
+the `numpy` extra.
+"""
+import collections.abc
+import math
+import struct
+
+import numpy
+
+# the header of the binary format: a magic number, the length of the n-grams,
+# and the floor and ceiling log-probabilities
+HEADER = struct.Struct("<8sB7xdd")
+MAGIC = b"SYS97NG1"
+
+
+def encode(texts):
+    """Return the supplied text (or list of texts, which must be of equal
+    length) as an array of letter codes, with any character other than A
+    through Z coded as -1.
+    """
+
+    if isinstance(texts, str):
+        data = numpy.frombuffer(texts.encode("ascii"), dtype=numpy.uint8)
+    else:
+        data = numpy.frombuffer(
+            "".join(texts).encode("ascii"), dtype=numpy.uint8
+        ).reshape(len(texts), -1)
+
+    codes = data.astype(numpy.int64) - ord("A")
+    codes[(codes < 0) | (codes >= 26)] = -1
+
+    return codes
+
+
+class NGrams(collections.abc.Mapping):
+    """This class implements an n-gram language model.
+
+    It behaves as a read-only mapping from each observed n-gram to its
+    log-probability.
+
+    """
+
+    def codes(self, texts):
+        """Return the codes of every n-gram of the supplied text (or batch of
+        texts) along the last axis, with -1 marking the n-grams that contain a
+        character other than A through Z.
+        """
+
+        letters = encode(texts)
+        length = letters.shape[-1] - self.n + 1
+        if length <= 0:
+            return numpy.zeros(letters.shape[:-1] + (0,), dtype=numpy.int64)
+
+        codes = numpy.zeros(letters.shape[:-1] + (length,), dtype=numpy.int64)
+        valid = numpy.ones(codes.shape, dtype=bool)
+        for i in range(self.n):
+            window = letters[..., i : i + length]
+            codes = codes * 26 + window
+            valid &= window >= 0
+
+        codes[~valid] = -1
+        return codes
+
+    def score(self, text):
+        """ Return the sum of the log-probabilities of the n-grams of text. """
+
+        codes = self.codes(text)
+        return float(
+            numpy.where(
+                codes >= 0, self.table[numpy.maximum(codes, 0)], self.floor
+            ).sum(dtype=numpy.float64)
+        )
+
+    def score_at(self, text, starts):
+        """Return the sum of the log-probabilities of the n-grams of text (a
+        string, or a sequence of characters) beginning at each of `starts`.
+
+        This allows a search which changes only a few characters of a text to
+        rescore only the n-grams which cover them.
+        """
+
+        letters = encode("".join(text))
+        starts = numpy.fromiter(starts, dtype=numpy.int64)
+
+        codes = numpy.zeros(len(starts), dtype=numpy.int64)
+        valid = numpy.ones(len(starts), dtype=bool)
+        for i in range(self.n):
+            window = letters[starts + i]
+            codes = codes * 26 + window
+            valid &= window >= 0
+
+        return float(
+            numpy.where(
+                valid, self.table[numpy.where(valid, codes, 0)], self.floor
+            ).sum(dtype=numpy.float64)
+        )
+
+    def score_batch(self, texts):
+        """Return an array of the scores of each of the supplied texts, which
+        are scored all at once if they are of equal length.
+        """
+
+        if len(set(map(len, texts))) > 1:
+            return numpy.array([self.score(text) for text in texts])
+        if not texts:
+            return numpy.zeros(0)
+
+        codes = self.codes(list(texts))
+        return numpy.where(
+            codes >= 0, self.table[numpy.maximum(codes, 0)], self.floor
+        ).sum(axis=-1, dtype=numpy.float64)
+
+    def save(self, path):
+        """ Save this model to the supplied path, in the binary format. """
+
+        with open(path, "wb") as fh:
+            fh.write(HEADER.pack(MAGIC, self.n, self.floor, self.ceiling))
+            fh.write(numpy.asarray(self.table, dtype="<f4").tobytes())
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Load a model from the supplied path, in the binary format. If `mmap`
+        is set, the table is memory-mapped rather than read into memory.
+        """
+
+        with open(path, "rb") as fh:
+            magic, n, floor, ceiling = HEADER.unpack(fh.read(HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f"{str(path)!r} is not an n-gram model")
+
+            if not mmap:
+                table = numpy.frombuffer(fh.read(), dtype="<f4")
+
+        if mmap:
+            table = numpy.memmap(
+                path, dtype="<f4", mode="r", offset=HEADER.size
+            )
+
+        if len(table) != 26 ** n:
+            raise ValueError(f"{str(path)!r} is truncated")
+
+        return cls(n, table, floor, ceiling)
+
+    @classmethod
+    def from_counts(cls, counts, floor=None):
+        """Build a model from a mapping of n-grams to the number of times that
+        they were observed.
+
+        The floor defaults to the log-probability of an n-gram which was
+        observed a hundredth of a time.
+        """
+
+        counts = {k.upper(): v for k, v in counts.items()}
+        lengths = set(map(len, counts))
+        if len(lengths) != 1:
+            raise ValueError("n-grams are not all of the same length")
+
+        (n,) = lengths
+        total = sum(counts.values())
+        if floor is None:
+            floor = math.log10(0.01 / total)
+
+        table = numpy.full(26 ** n, floor, dtype=numpy.float32)
+        for ngram, count in counts.items():
+            table[cls.index(ngram)] = math.log10(count / total)
+
+        return cls(n, table, floor)
+
+    @classmethod
+    def read(cls, path, floor=None):
+        """Build a model from the supplied text file, which contains one
+        n-gram and its count per line, separated by whitespace.
+        """
+
+        counts = {}
+        with open(path, "r") as fh:
+            for line in fh:
+                if line.strip():
+                    ngram, count = line.split()
+                    counts[ngram] = int(count)
+
+        return cls.from_counts(counts, floor)
+
+    @staticmethod
+    def index(ngram):
+        """ Return the base-26 code of the supplied n-gram. """
+
+        code = 0
+        for c in ngram:
+            if not ("A" <= c <= "Z"):
+                raise ValueError(f"{ngram!r} is not an n-gram of A-Z")
+            code = code * 26 + ord(c) - ord("A")
+
+        return code
+
+    def __getitem__(self, ngram):
+        if len(ngram) != self.n:
+            raise KeyError(ngram)
+
+        try:
+            value = float(self.table[self.index(ngram)])
+        except ValueError:
+            raise KeyError(ngram)
+
+        if value == self.floor:
+            raise KeyError(ngram)
+
+        return value
+
+    def __iter__(self):
+        for code in numpy.flatnonzero(self.table != self.floor):
+            ngram = []
+            for _ in range(self.n):
+                code, c = divmod(int(code), 26)
+                ngram.append(chr(ord("A") + c))
+
+            yield "".join(reversed(ngram))
+
+    def __len__(self):
+        return int(numpy.count_nonzero(self.table != self.floor))
+
+    def __init__(self, n, table, floor, ceiling=None):
+        """Construct a model of n-grams of length `n`.
+
+        - `table` expects an array of the 26 ** n log-probabilities.
+        - `floor` expects the log-probability assigned to n-grams which were
+          never observed.
+        - `ceiling` expects a bound on the log-probability of any n-gram; it
+          defaults to the greatest log-probability in the table.
+
+        """
+
+        if len(table) != 26 ** n:
+            raise ValueError(f"expected {26 ** n} log-probabilities")
+
+        self.n = n
+        self.table = table
+        self.floor = float(numpy.float32(floor))
+        if ceiling is None:
+            ceiling = numpy.max(table)
+        self.ceiling = float(ceiling)
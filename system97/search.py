@@ -0,0 +1,459 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# search.py
+# Copyright (c) 2020 Hugh Coleman
+#
+# This file is part of hughcoleman/system97, a historically accurate simulator
+# of the "System 97" or Type-B Cipher Machine. It is released under the MIT
+# License (see LICENSE.)
+""" Implements key searches over the settings of the System97 simulator.
+
+Each search decrypts a ciphertext under many candidate settings, and ranks the
+candidates with a `scorer`; a function which accepts a plaintext and returns a
+number, where higher is better. Scorers are sent to worker processes, and so
+must be picklable (for example, a function defined at the top level of a
+module).
+
+Candidate settings are reported in the form returned by `System97.snapshot`;
+that is, `(sixes, I, II, III, speeds)`.
+
+Where the scorer is an n-gram model, `bounded_search` instead decrypts and
+scores each candidate a block at a time, and abandons it as soon as it can no
+longer place among the best.
+
+Short messages do not exercise every switch, and so many settings decrypt them
+identically; `equivalent_states` enumerates one setting of each such class.
+
+Once the switch settings are known, the remainder of the plugboard can be
+recovered by simulated annealing over the order of the twenties letters.
+"""
+import concurrent.futures
+import heapq
+import itertools
+import math
+import random
+
+import system97.engine
+import system97.machine
+import system97.parallel
+import system97.plugboard
+import system97.switch
+
+# every order in which the twenties switches can be assigned their speeds
+SPEEDS = list(itertools.permutations([1, 2, 3]))
+
+
+def _step_times(length, sixes, medium):
+    """Return the times at which each of the fast, medium and slow switches
+    step over the course of a message of `length` characters, given the
+    starting positions of the sixes and medium switches.
+    """
+
+    # the switches step between characters, so there is one step fewer
+    pattern = system97.engine.step_pattern(sixes, medium, max(length - 1, 0))
+
+    return tuple(
+        tuple(
+            itertools.compress(
+                range(len(pattern)),
+                pattern.translate(system97.engine.ROLES[role]),
+            )
+        )
+        for role in range(3)
+    )
+
+
+def equivalent_states(length, sixes, speeds=SPEEDS):
+    """Yield one representative state (of the form returned by
+    `System97.snapshot`) for each class of candidate settings that decrypt
+    every message of `length` characters identically, given the starting
+    position of the sixes switch, along with the number of settings in the
+    class; that is, pairs of `(state, multiplicity)`.
+
+    Settings are equivalent when the stepping switches pass through the same
+    positions over the message. The starting positions of the twenties
+    switches each select a different wiring, and so never coincide; but the
+    speed orders under which each switch steps at the same times are
+    equivalent. For example, a switch which does not step during the message
+    behaves the same whatever its speed, so for a message which ends before
+    the medium switch first steps, the number of candidates is halved.
+    """
+
+    if length < 0:
+        raise ValueError(f"cannot enumerate settings for {length} characters")
+
+    # the times at which each speed steps depend only upon the position of
+    # the medium switch, and are numbered so that they can be compared cheaply
+    numbers = {}
+    times = [
+        [
+            numbers.setdefault(t, len(numbers))
+            for t in _step_times(length, sixes, medium)
+        ]
+        for medium in range(25)
+    ]
+
+    for i, ii, iii in itertools.product(range(25), repeat=3):
+        positions = [None, i, ii, iii]
+
+        classes = {}
+        for order in speeds:
+            steps = times[positions[order[1]]]
+            key = tuple(steps[order.index(switch)] for switch in [1, 2, 3])
+
+            if key in classes:
+                classes[key][1] += 1
+            else:
+                classes[key] = [(sixes, i, ii, iii, tuple(order)), 1]
+
+        for state, multiplicity in classes.values():
+            yield state, multiplicity
+
+
+def _search_twenties(ciphertext, plugboard, sixes, scorer, top, task):
+    """Score every candidate with the supplied speeds and position of
+    twenties switch I, and return the best `top` of them.
+    """
+
+    speeds, i = task
+
+    plugboard = system97.plugboard.Plugboard(plugboard)
+    data = plugboard.encode(ciphertext.encode("ascii"))
+
+    routing = system97.switch.SteppingSwitch("SIXES").forward
+    _, twenties = system97.engine.twenties()
+
+    # within a shard the position of the sixes switch and the speeds are
+    # fixed, so the switches step in one of only 25 patterns; one for each
+    # starting position of the medium switch
+    patterns = [
+        system97.engine.step_pattern(sixes, medium, len(data))
+        for medium in range(25)
+    ]
+
+    results = []
+    for ii, iii in itertools.product(range(25), repeat=2):
+        state = (sixes, i, ii, iii, speeds)
+
+        # route the message a window at a time, so that the offsets of only
+        # one window are held in memory at once
+        x = bytearray()
+        windows = system97.engine.windows(
+            state, len(data), patterns[state[speeds[1]]]
+        )
+        for start, (positions, indices) in zip(
+            range(0, len(data), system97.engine.WINDOW), windows
+        ):
+            x += system97.engine.route_offsets(
+                data[start : start + len(positions)],
+                positions,
+                indices,
+                routing,
+                twenties,
+            )
+
+        results.append(
+            (scorer(x.translate(plugboard.reverse).decode("ascii")), state)
+        )
+
+    return heapq.nlargest(top, results)
+
+
+def search_twenties(
+    ciphertext,
+    plugboard,
+    sixes,
+    scorer,
+    top=10,
+    speeds=SPEEDS,
+    workers=None,
+):
+    """Search every starting position of the twenties switches, under every
+    supplied speed order, for the supplied ciphertext, given the plugboard and
+    the starting position of the sixes switch.
+
+    The 25 ** 3 * 6 = 93,750 candidates are split into shards, one for each
+    speed order and position of twenties switch I, which are spread across
+    `workers` processes (by default, one for each available processor). The
+    best `top` candidates are returned as a list of `(score, state)` pairs,
+    best first.
+    """
+
+    workers = system97.parallel.resolve_workers(workers)
+
+    tasks = list(itertools.product(speeds, range(25)))
+    arguments = [
+        [ciphertext] * len(tasks),
+        [str(plugboard)] * len(tasks),
+        [sixes] * len(tasks),
+        [scorer] * len(tasks),
+        [top] * len(tasks),
+        tasks,
+    ]
+
+    if workers == 1:
+        results = map(_search_twenties, *arguments)
+        return heapq.nlargest(top, itertools.chain.from_iterable(results))
+
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        results = executor.map(_search_twenties, *arguments)
+        return heapq.nlargest(top, itertools.chain.from_iterable(results))
+
+
+def _model(ngrams, floor=None, ceiling=None):
+    """Return the length of the n-grams in the mapping `ngrams`, together with
+    the score of a missing n-gram and the best score of any n-gram, unless
+    they are supplied.
+
+    These are taken from the model if it is a `system97.scoring.NGrams`, and
+    otherwise the floor defaults to somewhat less than the least likely
+    n-gram, and the ceiling to the most likely n-gram.
+    """
+
+    n = getattr(ngrams, "n", None)
+    if n is None:
+        n = len(next(iter(ngrams)))
+    if floor is None:
+        floor = getattr(ngrams, "floor", None)
+    if floor is None:
+        floor = min(ngrams.values()) - 1.0
+    if ceiling is None:
+        ceiling = getattr(ngrams, "ceiling", None)
+    if ceiling is None:
+        ceiling = max(ngrams.values())
+
+    return n, floor, ceiling
+
+
+def bounded_search(
+    ciphertext,
+    states,
+    plugboard,
+    ngrams,
+    top=10,
+    block=64,
+    floor=None,
+    ceiling=None,
+):
+    """Score each of the supplied candidate states (of the form returned by
+    `System97.snapshot`) for the supplied ciphertext by branch and bound,
+    keeping the best `top` of them.
+
+    Candidates are scored by the log-probabilities of their n-grams, as in
+    `solve_plugboard`. Each candidate is decrypted and scored `block`
+    characters at a time; since no n-gram can score more than `ceiling`
+    (which defaults to the most likely n-gram), the candidate is abandoned as
+    soon as its partial score, plus `ceiling` for each n-gram yet to be
+    scored, falls below the score of the `top`-th best candidate so far.
+    Candidates which are abandoned could not have placed among the best, and
+    so the results are those of scoring every candidate in full.
+
+    The positions of the switches over each block are computed from the step
+    pattern of the candidate (see `system97.engine.offsets`), rather than
+    taken from the trajectory cache, which a search over many states would
+    only flush.
+
+    Returns a dictionary with the keys `results`, a list of `(score, state)`
+    pairs, best first, and `pruned`, the number of characters that were never
+    decrypted.
+    """
+
+    if top < 1:
+        raise ValueError(f"cannot keep the best {top} candidates")
+    if block < 1:
+        raise ValueError(f"cannot decrypt in blocks of {block} characters")
+
+    n, floor, ceiling = _model(ngrams, floor, ceiling)
+
+    # translate the ciphertext through the plugboard once, for every state
+    plugboard = system97.plugboard.Plugboard(plugboard)
+    data = plugboard.encode(ciphertext.encode("ascii"))
+
+    sixes = system97.switch.SteppingSwitch("SIXES").forward
+    _, twenties = system97.engine.twenties()
+    total = max(len(ciphertext) - n + 1, 0)
+
+    # the switches step in one of only 625 patterns over the message; one for
+    # each starting position of the sixes and medium switches
+    patterns = {}
+
+    results = []
+    pruned = 0
+    for state in states:
+        # the k-th best score, which a candidate must reach to place
+        threshold = results[0][0] if len(results) == top else -math.inf
+
+        speeds = state[4]
+        key = (state[0], state[speeds[1]])
+        if key not in patterns:
+            patterns[key] = system97.engine.step_pattern(*key, len(data))
+        pattern = patterns[key]
+
+        # the last n - 1 characters of plaintext, which begin n-grams that
+        # are completed by the next block
+        carry = ""
+        score = 0.0
+        scored = 0
+        current = list(state)
+        for m in range(0, len(data), block):
+            chunk = data[m : m + block]
+            steps = pattern[m : m + len(chunk)]
+
+            positions, indices = system97.engine.offsets(
+                tuple(current), len(chunk), steps
+            )
+            text = carry + (
+                system97.engine.route_offsets(
+                    chunk, positions, indices, sixes, twenties
+                )
+                .translate(plugboard.reverse)
+                .decode("ascii")
+            )
+
+            # advance the switches to the start of the next block
+            current[0] = (current[0] + len(chunk)) % 25
+            for role, switch in enumerate(speeds):
+                current[switch] = (current[switch] + steps.count(role)) % 25
+
+            # score the n-grams which are complete, and bound the rest
+            starts = range(max(len(text) - n + 1, 0))
+            score += _ngram_score(ngrams, n, floor, text, starts)
+            scored += len(starts)
+            carry = text[len(starts) :]
+
+            if score + (total - scored) * ceiling < threshold:
+                pruned += len(data) - m - len(chunk)
+                break
+        else:
+            if len(results) < top:
+                heapq.heappush(results, (score, state))
+            elif (score, state) > results[0]:
+                heapq.heapreplace(results, (score, state))
+
+    return {"results": sorted(results, reverse=True), "pruned": pruned}
+
+
+def _ngram_score(ngrams, n, floor, plain, starts):
+    """Sum the scores of the n-grams of `plain` beginning at `starts`, all at
+    once if `ngrams` is a `system97.scoring.NGrams`.
+    """
+
+    if hasattr(ngrams, "score_at") and (floor == ngrams.floor):
+        return ngrams.score_at(plain, starts)
+
+    return sum(ngrams.get("".join(plain[s : s + n]), floor) for s in starts)
+
+
+def solve_plugboard(
+    ciphertext,
+    state,
+    sixes,
+    ngrams,
+    floor=None,
+    plugboard=None,
+    iterations=20000,
+    temperature=10.0,
+    seed=None,
+):
+    """Recover the order of the twenty twenties letters on the plugboard by
+    simulated annealing, given the starting state of the switches (of the
+    form returned by `System97.snapshot`) and the six sixes letters, in order.
+
+    Candidates are scored by the log-probabilities of their n-grams, which are
+    supplied as a mapping `ngrams` from n-gram to log-probability; n-grams that
+    are missing score `floor`, which defaults to the floor of the model if it
+    is a `system97.scoring.NGrams`, and otherwise to somewhat less than the
+    least likely n-gram. The search begins from `plugboard`, if supplied, and
+    otherwise from the twenties letters in alphabetical order.
+
+    Each iteration swaps two twenties letters. Only the characters which are
+    affected by the swap (those which are either enciphered from, or
+    deciphered to, one of the swapped letters) are decrypted again, and only
+    the n-grams which cover them are rescored, so that an iteration costs time
+    proportional to the number of affected characters rather than the length
+    of the message.
+
+    Returns a dictionary with the keys `plugboard` and `score`, describing the
+    best plugboard that was found.
+    """
+
+    n, floor, _ = _model(ngrams, floor)
+
+    if plugboard is None:
+        plugboard = sixes + "".join(
+            sorted(system97.machine.System97.CHARSET - set(sixes))
+        )
+    wiring = list(system97.plugboard.Plugboard(plugboard))
+    if "".join(wiring[:6]) != sixes:
+        raise ValueError(f"{plugboard!r} does not begin with {sixes!r}")
+
+    rng = random.Random(seed)
+    _, decrypt = system97.engine.twenties()
+    positions = system97.engine.trajectory(state, len(ciphertext))
+
+    # decrypt the sixes letters once and for all, and record where each of the
+    # twenties letters occurs in the ciphertext
+    machine = system97.machine.System97(plugboard=plugboard)
+    machine.restore(state)
+    plain = list(machine.sixes_stream(ciphertext))
+    bases = [None] * len(ciphertext)
+    by_letter = {c: [] for c in wiring[6:]}
+    for k, c in enumerate(ciphertext):
+        if c in by_letter:
+            bases[k] = (
+                (positions[4 * k + 1] * 25 + positions[4 * k + 2]) * 25
+                + positions[4 * k + 3]
+            ) * 20 - 6
+            by_letter[c].append(k)
+
+    # and keep track of which characters are deciphered to each input
+    indices = {c: i for i, c in enumerate(wiring)}
+    outputs = [None] * len(ciphertext)
+    by_output = [set() for _ in range(26)]
+
+    def update(affected):
+        for k in affected:
+            x = decrypt[bases[k] + indices[ciphertext[k]]]
+            if outputs[k] is not None:
+                by_output[outputs[k]].discard(k)
+            by_output[x].add(k)
+            outputs[k] = x
+            plain[k] = wiring[x]
+
+    update([k for ks in by_letter.values() for k in ks])
+
+    starts = range(len(ciphertext) - n + 1)
+    score = _ngram_score(ngrams, n, floor, plain, starts)
+    best = (score, "".join(wiring))
+
+    for iteration in range(iterations):
+        i, j = rng.sample(range(6, 26), 2)
+        a, b = wiring[i], wiring[j]
+
+        affected = set(by_letter[a])
+        affected.update(by_letter[b], by_output[i], by_output[j])
+        windows = {
+            s
+            for k in affected
+            for s in range(max(0, k - n + 1), min(k, len(plain) - n) + 1)
+        }
+
+        before = _ngram_score(ngrams, n, floor, plain, windows)
+
+        wiring[i], wiring[j] = b, a
+        indices[a], indices[b] = j, i
+        update(affected)
+
+        delta = _ngram_score(ngrams, n, floor, plain, windows) - before
+
+        t = temperature * (1 - iteration / iterations)
+        if (delta >= 0) or ((t > 0) and (rng.random() < math.exp(delta / t))):
+            score += delta
+            if score > best[0]:
+                best = (score, "".join(wiring))
+        else:
+            wiring[i], wiring[j] = a, b
+            indices[a], indices[b] = i, j
+            update(affected)
+
+    return {"plugboard": best[1], "score": best[0]}
@@ -86,9 +86,23 @@ Numerical versions of this data is available in system97.logic under names
 `SIXES`, `TWENTIES_I`, `TWENTIES_II`, and `TWENTIES_III`.
 
 """
+import system97.logic
 
 
 class SteppingSwitch:
+    __slots__ = ("_routing_logic", "position", "size", "forward", "inverse")
+
+    @property
+    def routing_logic(self):
+        """The logical network of this stepping switch, as a dictionary of
+        layers, each associated with a list of output values.
+        """
+
+        if isinstance(self._routing_logic, str):
+            return getattr(system97.logic, self._routing_logic)
+
+        return self._routing_logic
+
     def step(self):
         """Step the wiper arm of this SteppingSwitch one position forwards,
         looping back to zero in the case of an overflow.
@@ -96,30 +110,46 @@ class SteppingSwitch:
 
         self.position = (self.position + 1) % self.size
 
+    def unstep(self):
+        """Step the wiper arm of this SteppingSwitch one position backwards,
+        looping back to the last position in the case of an underflow. This
+        undoes SteppingSwitch.step.
+        """
+
+        self.position = (self.position - 1) % self.size
+
+    def snapshot(self):
+        """ Return the state of this SteppingSwitch; that is, its position. """
+
+        return self.position
+
+    def restore(self, state):
+        """ Restore a state previously returned by SteppingSwitch.snapshot. """
+
+        self.position = state
+
     def encrypt(self, char):
         """Feed the supplied character backwards through the stepping switch's
         logical network.
         """
 
-        # TODO: generate inverse logic tables to ensure that this is more
-        # efficient
-        return {
-            self.routing_logic[k][self.position]: k
-            for k in self.routing_logic.keys()
-        }[char]
+        return self.inverse[self.position][char]
 
     def decrypt(self, char):
         """Feed the supplied chararacter forwards through the stepping
         switch's logical network.
         """
 
-        return self.routing_logic[char][self.position]
+        return self.forward[self.position][char]
 
     def __init__(self, routing_logic, position=0, size=25):
         """Construct a stepping switch with the given logical network.
 
         - `routing_logic` expects a dictionary, with keys representing the
-          different layers, each associated with a list of output values.
+          different layers, each associated with a list of output values; or
+          the name of one of the networks in system97.logic (e.g. "SIXES"),
+          whose routing is then sliced from its packed form without ever
+          being unpacked into a dictionary.
         - `position` expects an integer specifying the initial position of the
           rotor arm.
         - `size` expects an integer specifying the number of possible arm
@@ -129,12 +159,33 @@ class SteppingSwitch:
 
         """
 
-        if any(size != len(vs) for vs in routing_logic.values()):
+        if isinstance(routing_logic, str):
+            lengths = [system97.logic.SIZE]
+        else:
+            lengths = (len(vs) for vs in routing_logic.values())
+
+        if any(size != length for length in lengths):
             raise ValueError(f"uneven routing_logic matrix")
 
         if (position < 0) or (size <= position):
             raise ValueError(f"cannot set stepper arm position to {position}")
 
-        self.routing_logic = routing_logic
+        self._routing_logic = routing_logic
         self.position = position
         self.size = size
+
+        # Precompute the routing performed at each arm position, in both
+        # directions, so that feeding a signal through the switch is a single
+        # lookup regardless of direction.
+        if isinstance(routing_logic, str):
+            # the tables of the named wirings are shared between switches
+            self.forward, self.inverse = system97.logic.routes(routing_logic)
+        else:
+            self.forward = [
+                {k: vs[p] for k, vs in routing_logic.items()}
+                for p in range(size)
+            ]
+            self.inverse = [
+                {vs[p]: k for k, vs in routing_logic.items()}
+                for p in range(size)
+            ]
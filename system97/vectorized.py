@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# vectorized.py
+# Copyright (c) 2020 Hugh Coleman
+#
+# This file is part of hughcoleman/system97, a historically accurate simulator
+# of the "System 97" or Type-B Cipher Machine. It is released under the MIT
+# License (see LICENSE.)
+""" Implements a vectorized engine for the System97 simulator.
+
+Rather than stepping the machine once per character, the positions of all four
+stepping switches are computed for every offset in the message at once (see
+`system97.machine.count_steps`), and the output is gathered from the compiled
+tables in `system97.engine` in a single pass.
+
+This module requires NumPy, which can be installed alongside this package with
+the `numpy` extra.
+"""
+import numpy
+
+import system97.engine
+import system97.machine
+
+# the number of characters processed in a single pass; this bounds the size of
+# the intermediate arrays
+CHUNK = 1 << 20
+
+
+class VectorizedSystem97(system97.engine.CompiledSystem97):
+    """A System97 which encrypts and decrypts whole messages at once, using
+    NumPy.
+
+    """
+
+    __slots__ = ()
+
+    def _translate_into(self, src, dst, encrypt):
+        """Feed the contents of the buffer `src` through the machine, in the
+        direction given by `encrypt`, writing the output into the buffer `dst`.
+
+        The whole buffer is translated through the plugboard first, so that a
+        character which is not wired into it is reported before the machine is
+        stepped.
+        """
+
+        if encrypt:
+            sixes, twenties = self.sixes.inverse, self.compiled[0]
+        else:
+            sixes, twenties = self.sixes.forward, self.compiled[1]
+
+        sixes = numpy.array(
+            [[routing[n] for n in range(6)] for routing in sixes],
+            dtype=numpy.uint8,
+        ).ravel()
+        twenties = numpy.frombuffer(twenties, dtype=numpy.uint8)
+
+        data = self.plugboard.encode(src)
+
+        for start in range(0, len(data), CHUNK):
+            chunk = data[start : start + CHUNK]
+            dst[start : start + len(chunk)] = self._translate_chunk(
+                chunk, sixes, twenties
+            )
+
+    def _translate_chunk(self, data, sixes, twenties):
+        """Feed a chunk of signals (as translated through the plugboard)
+        through the machine, advance the machine past it, and return the
+        output.
+        """
+
+        n = numpy.frombuffer(data, dtype=numpy.uint8).astype(numpy.int32)
+
+        # compute the positions of all four switches at every offset
+        offsets = numpy.arange(len(data), dtype=numpy.int32)
+        fast, medium, slow = system97.machine.count_steps(
+            self.sixes.position, self.medium.position, offsets
+        )
+
+        positions = [None, None, None, None]
+        for switch, steps in [
+            (self.fast, fast),
+            (self.medium, medium),
+            (self.slow, slow),
+        ]:
+            positions[self.twenties.index(switch)] = (
+                switch.position + steps
+            ) % 25
+        sixes_ = (self.sixes.position + offsets) % 25
+
+        # look up every character in both the sixes and the twenties tables,
+        # and keep whichever applies; this is cheaper than masking
+        x = numpy.where(
+            n < 6,
+            sixes[sixes_ * 6 + numpy.minimum(n, 5)],
+            twenties[
+                ((positions[1] * 25 + positions[2]) * 25 + positions[3]) * 20
+                + numpy.clip(n - 6, 0, 19)
+            ],
+        )
+
+        # the illegible characters are passed through unchanged
+        x = numpy.where(n < 26, x, n).astype(numpy.uint8)
+
+        self.advance(len(data))
+
+        return x.tobytes().translate(self.plugboard.reverse)
@@ -16,3 +16,34 @@ __copyright__ = """Copyright (c) 2013 - 2014 Brian Neal
 Copyright (c) 2020 Hugh Coleman
 """
 __version__ = "1.0.0"
+
+import importlib.util
+import os
+
+# whether the optional NumPy dependency is installed
+HAVE_NUMPY = importlib.util.find_spec("numpy") is not None
+
+# This is the first part of the 14-part message which was delivered by the
+# Japanese to the U.S. Government on December 7, 1941. Illegible characters are
+# indicated by dashes.
+
+samples = os.path.join(os.path.dirname(__file__), "samples")
+
+ciphertext = None
+with open(os.path.join(samples, "ciphertext"), "r") as fh:
+    ciphertext = fh.read().strip()
+
+plaintext = None
+with open(os.path.join(samples, "plaintext"), "r") as fh:
+    plaintext = fh.read().strip()
+
+# check that samples are fetched
+if (not plaintext) or (not ciphertext):
+    raise RuntimeError("could not read plaintext/ciphertext samples")
+
+# the settings under which the samples were encrypted
+settings = {
+    "positions": {6: 8, 20: (0, 23, 5)},
+    "speeds": (2, 3, 1),
+    "plugboard": "NOKTYUXEQLHBRMPDICJASVWGZF",
+}
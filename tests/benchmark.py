@@ -0,0 +1,264 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# benchmark.py
+# Copyright (c) 2020 Hugh Coleman
+#
+# This file is part of hughcoleman/system97, a historically accurate simulator
+# of the "System 97" or Type-B Cipher Machine. It is released under the MIT
+# License (see LICENSE.)
+# You can run the benchmark suite by executing the following command while in
+# the root directory of the project.
+#
+#   python -m tests.benchmark --output benchmark.json
+#
+# The results are emitted as JSON, so that they can be compared between
+# releases. Pass `--max-size` to skip the larger (and slower) message sizes.
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+
+import system97
+import system97.codebook
+import system97.engine
+import system97.machine
+import system97.parallel
+import system97.switch
+from tests import HAVE_NUMPY, ciphertext, settings
+
+# CodebookSystem97 uses a codebook built into a temporary directory for the
+# duration of the run
+ENGINES = [
+    system97.machine.System97,
+    system97.engine.CompiledSystem97,
+    system97.codebook.CodebookSystem97,
+]
+if HAVE_NUMPY:
+    import system97.vectorized
+
+    ENGINES.append(system97.vectorized.VectorizedSystem97)
+
+# message sizes, in characters, from 100 B to 100 MB
+SIZES = [10 ** 2, 10 ** 4, 10 ** 6, 10 ** 8]
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.join(ROOT, "scripts", "system97")
+
+
+def message(size, seed=97):
+    """ Generate a random message of the supplied size. """
+
+    rng = random.Random(seed)
+    return "".join(
+        rng.choices(sorted(system97.machine.System97.CHARSET), k=size)
+    )
+
+
+def best(function, repeat):
+    """ Return the shortest wall time of `repeat` calls to `function`. """
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+
+    return min(times)
+
+
+def bench_machine(sizes, repeat):
+    """ Measure the throughput of each engine's encrypt and decrypt. """
+
+    results = []
+    for size in sizes:
+        text = message(size)
+
+        for engine in ENGINES:
+            machine = engine(**settings)
+
+            for mode in ["encrypt", "decrypt"]:
+
+                def run():
+                    machine.reset()
+                    getattr(machine, mode)(text)
+
+                seconds = best(run, repeat if size < 10 ** 6 else 1)
+                results.append(
+                    {
+                        "engine": engine.__name__,
+                        "operation": mode,
+                        "size": size,
+                        "seconds": seconds,
+                        "chars_per_second": size / seconds,
+                    }
+                )
+
+    return results
+
+
+def bench_switch(number):
+    """ Measure the per-call cost of the SteppingSwitch operations. """
+
+    switch = system97.switch.SteppingSwitch("TWENTIES_I")
+
+    return [
+        {
+            "operation": operation,
+            "seconds_per_call": timeit.timeit(call, number=number) / number,
+        }
+        for operation, call in [
+            ("encrypt", lambda: switch.encrypt(7)),
+            ("decrypt", lambda: switch.decrypt(7)),
+            ("step", switch.step),
+        ]
+    ]
+
+
+def bench_construction(number):
+    """ Measure the cost of constructing each engine. """
+
+    results = []
+    for engine in ENGINES:
+        # make sure that the one-off cost of compiling tables is not included
+        engine(**settings)
+
+        results.append(
+            {
+                "engine": engine.__name__,
+                "seconds_per_call": timeit.timeit(
+                    lambda: engine(**settings), number=number
+                )
+                / number,
+            }
+        )
+
+    return results
+
+
+def bench_batch(repeat):
+    """Measure the cost of decrypting a batch of short messages with
+    decrypt_many, against constructing a new machine for each of them.
+    """
+
+    messages = [
+        (
+            dict(settings, positions={6: k % 25, 20: (k % 7, k % 11, 3)}),
+            ciphertext[k : k + 20],
+        )
+        for k in range(0, 1000, 2)
+    ]
+
+    def naive():
+        return [
+            system97.machine.System97(**kwargs).decrypt(text)
+            for kwargs, text in messages
+        ]
+
+    def batched():
+        return system97.parallel.decrypt_many(messages, workers=1)
+
+    return [
+        {
+            "operation": operation,
+            "messages": len(messages),
+            "seconds": best(function, repeat),
+        }
+        for operation, function in [("naive", naive), ("batched", batched)]
+    ]
+
+
+def bench_cli(sizes):
+    """ Measure the end-to-end wall time of scripts/system97. """
+
+    results = []
+    for size in sizes:
+        with tempfile.NamedTemporaryFile("w", suffix=".txt") as fh:
+            fh.write(message(size))
+            fh.flush()
+
+            for mode in ["--encrypt", "--decrypt"]:
+                start = time.perf_counter()
+                subprocess.run(
+                    [
+                        sys.executable,
+                        SCRIPT,
+                        mode,
+                        "--switches",
+                        "9-1,24,6-23",
+                        "--plugboard",
+                        settings["plugboard"],
+                        fh.name,
+                    ],
+                    check=True,
+                    stdout=subprocess.DEVNULL,
+                    env=dict(os.environ, PYTHONPATH=ROOT),
+                )
+                seconds = time.perf_counter() - start
+
+                results.append(
+                    {
+                        "operation": mode.lstrip("-"),
+                        "size": size,
+                        "seconds": seconds,
+                        "chars_per_second": size / seconds,
+                    }
+                )
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--max-size",
+        type=int,
+        default=max(SIZES),
+        help="largest message size to benchmark, in characters",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="number of repetitions of each timing; the best is reported",
+    )
+    parser.add_argument(
+        "--number",
+        type=int,
+        default=100000,
+        help="number of calls when timing individual operations",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=argparse.FileType("w"),
+        default=sys.stdout,
+        help="file to write the JSON results to",
+    )
+
+    args = parser.parse_args()
+    sizes = [size for size in SIZES if size <= args.max_size]
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["SYSTEM97_CODEBOOK"] = system97.codebook.build(
+            os.path.join(directory, "codebook")
+        ).as_posix()
+
+        results = {
+            "version": system97.__version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": bench_machine(sizes, args.repeat),
+            "switch": bench_switch(args.number),
+            "construction": bench_construction(args.number // 100),
+            "batch": bench_batch(args.repeat),
+            "cli": bench_cli(sizes),
+        }
+
+    json.dump(results, args.output, indent=2)
+    args.output.write("\n")
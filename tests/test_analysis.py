@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# test_analysis.py
+# Copyright (c) 2020 Hugh Coleman
+#
+# This file is part of hughcoleman/system97, a historically accurate simulator
+# of the "System 97" or Type-B Cipher Machine. It is released under the MIT
+# License (see LICENSE.)
+import unittest
+
+import system97.machine
+from tests import HAVE_NUMPY, ciphertext, plaintext, settings
+
+if HAVE_NUMPY:
+    import system97.analysis
+
+plugboard = settings["plugboard"]
+state = (8, 0, 23, 5, (2, 3, 1))
+
+
+@unittest.skipUnless(HAVE_NUMPY, "requires numpy")
+class TestAnalysis(unittest.TestCase):
+    def test__index(self):
+        """Ensure that the inverted index agrees with the stepping switches
+        at a selection of positions.
+        """
+
+        sixes, twenties = system97.analysis.index()
+        machine = system97.machine.System97()
+
+        for j in [0, 1, 624, 9876, 25 ** 3 - 1]:
+            machine.restore(
+                (j % 25, j // 625, j // 25 % 25, j % 25, (1, 2, 3))
+            )
+
+            for n in range(6):
+                x = machine.sixes.decrypt(n)
+                self.assertTrue((sixes[n][x] >> (j % 25)) & 1)
+
+            for n in range(6, 26):
+                x = machine.decrypt_twenties(n)
+                self.assertTrue((twenties[n - 6][x - 6] >> j) & 1)
+                self.assertIn(
+                    j, system97.analysis.members(twenties[n - 6][x - 6])
+                )
+
+    def test__members(self):
+        """Ensure that members returns the indices of exactly the set bits of
+        a bitset, in order.
+        """
+
+        for bitset in [0, 1, 6, (1 << 25) - 1, (1 << 1000) | (1 << 7)]:
+            self.assertEqual(
+                [n for n in range(bitset.bit_length()) if (bitset >> n) & 1],
+                system97.analysis.members(bitset),
+            )
+
+    def test__candidates(self):
+        """Ensure that candidates recovers the starting state from a crib,
+        and that every candidate decrypts the crib correctly.
+        """
+
+        for offset in [0, 100, 600]:
+            crib = slice(offset, offset + 30)
+            states = list(
+                system97.analysis.candidates(
+                    plaintext[crib], ciphertext[crib], plugboard, offset
+                )
+            )
+
+            self.assertIn(state, states)
+            for candidate in states:
+                machine = system97.machine.System97(plugboard=plugboard)
+                machine.restore(candidate)
+                machine.advance(offset)
+
+                self.assertEqual(
+                    plaintext[crib], machine.decrypt(ciphertext[crib])
+                )
+
+    def test__candidates_mixed(self):
+        """Ensure that a crib which pairs a sixes letter with a twenties
+        letter has no candidates.
+        """
+
+        self.assertEqual(
+            [], list(system97.analysis.candidates("N", "X", plugboard))
+        )
+
+    def test__find_crib(self):
+        """Ensure that find_crib returns exactly the offsets at which the
+        sixes letters of a crib line up with those of the ciphertext.
+        """
+
+        sixes = set(plugboard[:6])
+        for start, length in [(0, 20), (500, 30), (1000, 8), (1, 1)]:
+            crib = plaintext[start : start + length]
+
+            expected = [
+                offset
+                for offset in range(len(ciphertext) - length + 1)
+                if all(
+                    (c in "-/ ")
+                    or (x in "-/ ")
+                    or ((c in sixes) == (x in sixes))
+                    for c, x in zip(crib, ciphertext[offset:])
+                )
+            ]
+
+            offsets = system97.analysis.find_crib(ciphertext, crib, "YUTKON")
+
+            self.assertIn(start, offsets)
+            self.assertEqual(expected, offsets)
+
+        self.assertEqual(
+            [], system97.analysis.find_crib("AB", "ABC", "YUTKON")
+        )
+        with self.assertRaises(ValueError):
+            system97.analysis.find_crib(ciphertext, "ab", "YUTKON")
+
+    def test__sixes_letters(self):
+        """Ensure that sixes_letters identifies the sixes letters of the
+        sample message, and ranks every candidate set of letters.
+        """
+
+        ranked = system97.analysis.sixes_letters(ciphertext)
+
+        self.assertEqual("KNOTUY", ranked[0][1])
+        self.assertEqual(sorted(ranked, reverse=True), ranked)
+        self.assertGreater(ranked[0][0], ranked[1][0])
+
+    def test__recover_sixes(self):
+        """Ensure that recover_sixes recovers the order of the sixes letters
+        on the plugboard, and the starting position of the sixes switch, with
+        or without the sixes letters.
+        """
+
+        for letters in ["YUTKON", None]:
+            recovered = system97.analysis.recover_sixes(ciphertext, letters)
+
+            self.assertEqual("NOKTYU", recovered["plugboard"])
+            self.assertEqual(8, recovered["position"])
@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# test_codebook.py
+# Copyright (c) 2020 Hugh Coleman
+#
+# This file is part of hughcoleman/system97, a historically accurate simulator
+# of the "System 97" or Type-B Cipher Machine. It is released under the MIT
+# License (see LICENSE.)
+import os
+import stat
+import tempfile
+import unittest
+
+import system97.codebook
+import system97.engine
+import system97.machine
+from tests import ciphertext, plaintext, settings
+
+
+class TestCodebook(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.directory.name, "codebook")
+        system97.codebook.build(cls.path)
+
+    @classmethod
+    def tearDownClass(cls):
+        system97.codebook.load.cache_clear()
+        cls.directory.cleanup()
+
+    def test__codebook(self):
+        """Ensure that the codebook agrees with the stepping switches at a
+        selection of joint positions.
+        """
+
+        encrypt, decrypt = system97.codebook.load(self.path)
+        machine = system97.machine.System97()
+
+        for state in [(0, 0, 0, 0), (24, 24, 24, 24), (8, 0, 23, 5)]:
+            machine.restore(state + ((1, 2, 3),))
+            base = system97.codebook.state_index(*state)
+
+            for n in range(26):
+                if n < 6:
+                    expected = (
+                        machine.sixes.encrypt(n),
+                        machine.sixes.decrypt(n),
+                    )
+                else:
+                    expected = (
+                        machine.encrypt_twenties(n),
+                        machine.decrypt_twenties(n),
+                    )
+
+                self.assertEqual(
+                    expected, (encrypt[base + n], decrypt[base + n])
+                )
+
+    def test__encrypt(self):
+        """Ensure that CodebookSystem97.encrypt properly encrypts the supplied
+        plaintext.
+        """
+
+        machine = system97.codebook.CodebookSystem97(
+            codebook=self.path, **settings
+        )
+
+        self.assertEqual(ciphertext, machine.encrypt(plaintext))
+
+    def test__decrypt(self):
+        """Ensure that CodebookSystem97.decrypt properly decrypts the supplied
+        ciphertext, and leaves the trajectory cache alone.
+        """
+
+        machine = system97.codebook.CodebookSystem97(
+            codebook=self.path, **settings
+        )
+
+        cached = system97.engine.trajectory.cache_info()
+        self.assertEqual(plaintext, machine.decrypt(ciphertext))
+        self.assertEqual(cached, system97.engine.trajectory.cache_info())
+
+    def test__invalid_character(self):
+        """Ensure that a character which is not wired into the plugboard is
+        reported before the machine is stepped, as System97 does.
+        """
+
+        machine = system97.codebook.CodebookSystem97(
+            codebook=self.path, **settings
+        )
+        state = machine.snapshot()
+
+        self.assertRaises(
+            ValueError,
+            machine.decrypt,
+            "A" * (2 * system97.engine.WINDOW) + "a",
+        )
+        self.assertEqual(state, machine.snapshot())
+
+    def test__build(self):
+        """Ensure that the codebook is only built on request, and that the
+        built codebook is readable by every user.
+        """
+
+        path = os.path.join(self.directory.name, "missing")
+
+        self.assertRaises(FileNotFoundError, system97.codebook.load, path)
+        self.assertRaises(
+            FileNotFoundError,
+            system97.codebook.CodebookSystem97,
+            codebook=path,
+        )
+        self.assertFalse(os.path.exists(path))
+
+        machine = system97.codebook.CodebookSystem97(
+            codebook=path, create=True, **settings
+        )
+        self.assertEqual(plaintext, machine.decrypt(ciphertext))
+        self.assertEqual(0o644, stat.S_IMODE(os.stat(path).st_mode))
+
+    def test__invalid(self):
+        """Ensure that a corrupt codebook is rejected."""
+
+        path = os.path.join(self.directory.name, "corrupt")
+        with open(path, "wb") as fh:
+            fh.write(b"not a codebook")
+
+        self.assertRaises(ValueError, system97.codebook.load, path)
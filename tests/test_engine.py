@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# test_engine.py
+# Copyright (c) 2020 Hugh Coleman
+#
+# This file is part of hughcoleman/system97, a historically accurate simulator
+# of the "System 97" or Type-B Cipher Machine. It is released under the MIT
+# License (see LICENSE.)
+import itertools
+import unittest
+
+import system97.engine
+import system97.machine
+from tests import ciphertext, plaintext, settings
+
+
+class TestEngine(unittest.TestCase):
+    def test__twenties(self):
+        """Ensure that the compiled twenties tables agree with the twenties
+        switches at every joint position.
+        """
+
+        encrypt, decrypt = system97.engine.twenties()
+        machine = system97.machine.System97()
+
+        for i, ii, iii in itertools.product(range(25), repeat=3):
+            machine.twenties[1].position = i
+            machine.twenties[2].position = ii
+            machine.twenties[3].position = iii
+
+            base = system97.engine.twenties_index(i, ii, iii)
+
+            for n in range(6, 26):
+                self.assertEqual(
+                    machine.encrypt_twenties(n), encrypt[base + n - 6]
+                )
+                self.assertEqual(
+                    machine.decrypt_twenties(n), decrypt[base + n - 6]
+                )
+
+    def test__trajectory(self):
+        """Ensure that trajectory agrees with System97.step, and that it is
+        cached.
+        """
+
+        for speeds in itertools.permutations([1, 2, 3]):
+            machine = system97.machine.System97(
+                positions={6: 22, 20: (24, 24, 24)}, speeds=speeds
+            )
+            state = machine.snapshot()
+            positions = system97.engine.trajectory(state, 25 * 25 * 2)
+
+            for k in range(25 * 25 * 2):
+                self.assertEqual(
+                    tuple(positions[4 * k : 4 * k + 4]),
+                    machine.snapshot()[:4],
+                )
+                machine.step()
+
+            hits = system97.engine.trajectory.cache_info().hits
+            system97.engine.trajectory(state, 25 * 25 * 2)
+            self.assertEqual(
+                hits + 1, system97.engine.trajectory.cache_info().hits
+            )
+
+    def test__offsets(self):
+        """Ensure that offsets agrees with System97.step, across every carry,
+        from every position of the sixes switch, and across several windows.
+        """
+
+        for sixes, length in itertools.chain(
+            zip(range(25), itertools.repeat(25 * 25 * 2 + 7)),
+            [(3, 2 * system97.engine.WINDOW + 7)],
+        ):
+            for speeds in itertools.permutations([1, 2, 3]):
+                machine = system97.machine.System97()
+                machine.restore((sixes, 24, 23, sixes * 7 % 25, speeds))
+                state = machine.snapshot()
+
+                expected = ([], [])
+                for _ in range(length):
+                    positions = machine.snapshot()
+                    expected[0].append(positions[0])
+                    expected[1].append(
+                        system97.engine.twenties_index(*positions[1:4])
+                    )
+                    machine.step()
+
+                self.assertEqual(
+                    (bytes(expected[0]), expected[1]),
+                    system97.engine.offsets(state, length),
+                )
+
+        # the trajectory cache should be left alone
+        cached = system97.engine.trajectory.cache_info()
+        machine = system97.engine.CompiledSystem97(**settings)
+        machine.decrypt(ciphertext)
+        self.assertEqual(cached, system97.engine.trajectory.cache_info())
+
+    def test__encrypt(self):
+        """Ensure that CompiledSystem97.encrypt properly encrypts the supplied
+        plaintext.
+        """
+
+        machine = system97.engine.CompiledSystem97(**settings)
+
+        self.assertEqual(ciphertext, machine.encrypt(plaintext))
+
+    def test__decrypt(self):
+        """Ensure that CompiledSystem97.decrypt properly decrypts the supplied
+        ciphertext.
+        """
+
+        machine = system97.engine.CompiledSystem97(**settings)
+
+        self.assertEqual(plaintext, machine.decrypt(ciphertext))
+
+    def test__encrypt_into(self):
+        """Ensure that CompiledSystem97.encrypt_into writes the ciphertext
+        into the supplied buffer.
+        """
+
+        machine = system97.engine.CompiledSystem97(**settings)
+
+        output = bytearray(len(plaintext))
+        machine.encrypt_into(memoryview(plaintext.encode("ascii")), output)
+        self.assertEqual(ciphertext.encode("ascii"), output)
+
+        self.assertRaises(ValueError, machine.encrypt_into, b"AbC", output)
+
+    def test__invalid(self):
+        """Ensure that a character which is not wired into the plugboard is
+        reported before the machine is stepped, as System97 does.
+        """
+
+        text = "A" * (2 * system97.engine.WINDOW) + "a"
+        for engine in [
+            system97.machine.System97,
+            system97.engine.CompiledSystem97,
+        ]:
+            machine = engine(**settings)
+            state = machine.snapshot()
+
+            self.assertRaises(ValueError, machine.decrypt, text)
+            self.assertEqual(state, machine.snapshot())
+
+    def test__decrypt_bytes(self):
+        """Ensure that CompiledSystem97.decrypt_bytes decrypts the supplied
+        ciphertext bytes.
+        """
+
+        machine = system97.engine.CompiledSystem97(**settings)
+
+        self.assertEqual(
+            plaintext.encode("ascii"),
+            machine.decrypt_bytes(ciphertext.encode("ascii")),
+        )
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# test_logic.py
+# Copyright (c) 2020 Hugh Coleman
+#
+# This file is part of hughcoleman/system97, a historically accurate simulator
+# of the "System 97" or Type-B Cipher Machine. It is released under the MIT
+# License (see LICENSE.)
+import unittest
+
+import system97.logic
+import system97.switch
+
+names = ["SIXES", "TWENTIES_I", "TWENTIES_II", "TWENTIES_III"]
+
+
+class TestLogic(unittest.TestCase):
+    def test__routing_logic(self):
+        """Ensure that the unpacked routing logic is a permutation of the
+        input letters at every position.
+        """
+
+        for name in names:
+            routing_logic = getattr(system97.logic, name)
+            layers = system97.logic.layers(name)
+
+            self.assertEqual(list(layers), sorted(routing_logic))
+            for p in range(system97.logic.SIZE):
+                self.assertEqual(
+                    sorted(layers),
+                    sorted(vs[p] for vs in routing_logic.values()),
+                )
+
+    def test__forward(self):
+        """Ensure that logic.forward agrees with the unpacked routing
+        logic.
+        """
+
+        for name in names:
+            routing_logic = getattr(system97.logic, name)
+            layers = system97.logic.layers(name)
+            table = system97.logic.forward(name)
+
+            for p in range(system97.logic.SIZE):
+                for n in layers:
+                    self.assertEqual(
+                        routing_logic[n][p],
+                        table[p * len(layers) + n - layers.start],
+                    )
+
+    def test__inverse(self):
+        """Ensure that logic.inverse undoes logic.forward."""
+
+        for name in names:
+            layers = system97.logic.layers(name)
+            forward = system97.logic.forward(name)
+            inverse = system97.logic.inverse(name)
+
+            for p in range(system97.logic.SIZE):
+                base = p * len(layers)
+                for n in layers:
+                    x = forward[base + n - layers.start]
+                    self.assertEqual(n, inverse[base + x - layers.start])
+
+    def test__routes(self):
+        """Ensure that logic.routes agrees with logic.forward and
+        logic.inverse, and that switches share its tables.
+        """
+
+        for name in names:
+            layers = system97.logic.layers(name)
+            forward, inverse = system97.logic.routes(name)
+
+            for p in range(system97.logic.SIZE):
+                for n in layers:
+                    x = forward[p][n]
+                    self.assertEqual(
+                        system97.logic.forward(name)[
+                            p * len(layers) + n - layers.start
+                        ],
+                        x,
+                    )
+                    self.assertEqual(n, inverse[p][x])
+
+            a = system97.switch.SteppingSwitch(name)
+            b = system97.switch.SteppingSwitch(name, 5)
+            self.assertIs(a.forward, b.forward)
+            self.assertIs(a.inverse, b.inverse)
+
+    def test__exports(self):
+        """Ensure that the unpacked routing logic is exported by a star
+        import, and listed once by dir().
+        """
+
+        namespace = {}
+        exec("from system97.logic import *", namespace)
+        for name in names:
+            self.assertEqual(getattr(system97.logic, name), namespace[name])
+
+        listing = dir(system97.logic)
+        self.assertEqual(len(set(listing)), len(listing))
+        self.assertTrue(set(names) <= set(listing))
+
+    def test__missing(self):
+        """Ensure that unknown attributes still raise AttributeError."""
+
+        self.assertRaises(AttributeError, getattr, system97.logic, "SEVENS")
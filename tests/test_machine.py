@@ -7,28 +7,10 @@
 # This file is part of hughcoleman/system97, a historically accurate simulator
 # of the "System 97" or Type-B Cipher Machine. It is released under the MIT
 # License (see LICENSE.)
-import os
 import unittest
 
 import system97.machine
-
-# This is the first part of the 14-part message which was delivered by the
-# Japanese to the U.S. Government on December 7, 1941. Illegible characters are
-# indicated by dashes.
-
-samples = os.path.join(os.path.dirname(__file__), "samples")
-
-ciphertext = None
-with open(os.path.join(samples, "ciphertext"), "r") as fh:
-    ciphertext = fh.read().strip()
-
-plaintext = None
-with open(os.path.join(samples, "plaintext"), "r") as fh:
-    plaintext = fh.read().strip()
-
-# check that samples are fetched
-if (not plaintext) or (not ciphertext):
-    raise RuntimeError("could not read plaintext/ciphertext samples")
+from tests import ciphertext, plaintext, settings
 
 
 class TestSystem97(unittest.TestCase):
@@ -37,11 +19,7 @@ class TestSystem97(unittest.TestCase):
         plaintext.
         """
 
-        machine = system97.machine.System97(
-            positions={6: 8, 20: (0, 23, 5)},
-            speeds=(2, 3, 1),
-            plugboard="NOKTYUXEQLHBRMPDICJASVWGZF",
-        )
+        machine = system97.machine.System97(**settings)
 
         self.assertEqual(ciphertext, machine.encrypt(plaintext))
 
@@ -50,10 +28,196 @@ class TestSystem97(unittest.TestCase):
         ciphertext.
         """
 
+        machine = system97.machine.System97(**settings)
+
+        self.assertEqual(plaintext, machine.decrypt(ciphertext))
+
+    def test__encrypt_iter(self):
+        """Ensure that System97.encrypt_iter carries the machine state across
+        chunk boundaries.
+        """
+
+        machine = system97.machine.System97(**settings)
+
+        chunks = [plaintext[i : i + 37] for i in range(0, len(plaintext), 37)]
+        self.assertEqual(ciphertext, "".join(machine.encrypt_iter(chunks)))
+
+    def test__decrypt_iter(self):
+        """Ensure that System97.decrypt_iter carries the machine state across
+        chunk boundaries.
+        """
+
+        machine = system97.machine.System97(**settings)
+
+        chunks = [
+            ciphertext[i : i + 37] for i in range(0, len(ciphertext), 37)
+        ]
+        self.assertEqual(plaintext, "".join(machine.decrypt_iter(chunks)))
+
+    def test__sixes_stream(self):
+        """Ensure that System97.sixes_stream decrypts the sixes letters of the
+        supplied ciphertext, and only the sixes letters.
+        """
+
+        machine = system97.machine.System97(**settings)
+
+        expected = "".join(
+            p if c in "NOKTYU-/ " else "-"
+            for c, p in zip(ciphertext, plaintext)
+        )
+        self.assertEqual(expected, machine.sixes_stream(ciphertext))
+
+        # the machine should have advanced past the ciphertext
+        reference = system97.machine.System97(
+            positions=settings["positions"], speeds=settings["speeds"]
+        )
+        reference.advance(len(ciphertext))
+        self.assertEqual(reference.snapshot(), machine.snapshot())
+
+        self.assertRaises(ValueError, machine.sixes_stream, "ABCd")
+
+    def test__advance(self):
+        """Ensure that System97.advance agrees with repeatedly calling
+        System97.step.
+        """
+
+        for sixes in [0, 22, 23, 24]:
+            for positions in [(0, 0, 0), (24, 24, 24), (5, 23, 17)]:
+                machine = system97.machine.System97(
+                    positions={6: sixes, 20: positions}, speeds=(3, 1, 2)
+                )
+                reference = system97.machine.System97(
+                    positions={6: sixes, 20: positions}, speeds=(3, 1, 2)
+                )
+
+                for n in range(25 * 25 * 3):
+                    self.assertEqual(
+                        reference.sixes.position, machine.sixes.position
+                    )
+                    self.assertEqual(
+                        [s.position for s in reference.twenties[1:]],
+                        [s.position for s in machine.twenties[1:]],
+                    )
+
+                    reference.step()
+                    machine.advance(n % 2)
+                    if n % 2 == 0:
+                        machine.step()
+
+    def test__unstep(self):
+        """Ensure that System97.unstep exactly undoes System97.step, across
+        every carry.
+        """
+
+        for speeds in [(1, 2, 3), (3, 1, 2)]:
+            machine = system97.machine.System97(
+                positions={6: 20, 20: (24, 24, 24)}, speeds=speeds
+            )
+
+            states = []
+            for _ in range(25 * 25 * 2):
+                states.append(machine.snapshot())
+                machine.step()
+
+            for state in reversed(states):
+                machine.unstep()
+                self.assertEqual(state, machine.snapshot())
+
+    def test__decrypt_backwards(self):
+        """Ensure that System97.unstep allows a message to be decrypted
+        backwards from its end.
+        """
+
+        machine = system97.machine.System97(**settings)
+        machine.advance(len(ciphertext))
+
+        for c, p in zip(reversed(ciphertext), reversed(plaintext)):
+            machine.unstep()
+            state = machine.snapshot()
+
+            self.assertEqual(p, machine.decrypt(c))
+            machine.restore(state)
+
+    def test__seek(self):
+        """Ensure that System97.seek allows decryption to begin partway
+        through a message.
+        """
+
+        machine = system97.machine.System97(**settings)
+
+        for offset in [0, 1, 24, 25, 626, len(ciphertext) - 1]:
+            machine.seek(offset)
+            self.assertEqual(
+                plaintext[offset:], machine.decrypt(ciphertext[offset:])
+            )
+
+    def test__reset(self):
+        """Ensure that System97.reset allows a machine to be reused with new
+        starting positions.
+        """
+
         machine = system97.machine.System97(
-            positions={6: 8, 20: (0, 23, 5)},
-            speeds=(2, 3, 1),
-            plugboard="NOKTYUXEQLHBRMPDICJASVWGZF",
+            speeds=settings["speeds"], plugboard=settings["plugboard"]
         )
+        machine.encrypt(plaintext[:100])
 
-        self.assertEqual(plaintext, machine.decrypt(ciphertext))
+        machine.reset(settings["positions"])
+        self.assertEqual(ciphertext, machine.encrypt(plaintext))
+
+        self.assertRaises(ValueError, machine.reset, {6: 25, 20: (0, 0, 0)})
+
+    def test__snapshot(self):
+        """Ensure that System97.restore allows decryption to branch from a
+        state captured by System97.snapshot.
+        """
+
+        machine = system97.machine.System97(**settings)
+        machine.decrypt(ciphertext[:500])
+
+        state = machine.snapshot()
+        self.assertEqual(plaintext[500:], machine.decrypt(ciphertext[500:]))
+
+        machine.restore(state)
+        self.assertEqual(plaintext[500:], machine.decrypt(ciphertext[500:]))
+
+        # states are interchangeable between machines with the same plugboard
+        other = system97.machine.System97(plugboard=settings["plugboard"])
+        other.restore(state)
+        self.assertEqual(plaintext[500:], other.decrypt(ciphertext[500:]))
+
+    def test__encrypt_into(self):
+        """Ensure that System97.encrypt_into writes the ciphertext into the
+        supplied buffer.
+        """
+
+        machine = system97.machine.System97(**settings)
+
+        output = bytearray(len(plaintext) + 2)
+        self.assertEqual(
+            len(plaintext),
+            machine.encrypt_into(
+                plaintext.encode("ascii"), memoryview(output)[1:]
+            ),
+        )
+        self.assertEqual(ciphertext.encode("ascii"), output[1:-1])
+
+        self.assertRaises(
+            ValueError, machine.encrypt_into, b"ABC", bytearray(2)
+        )
+        self.assertRaises(TypeError, machine.encrypt_into, b"ABC", bytes(3))
+        self.assertRaises(
+            ValueError, machine.encrypt_into, b"AB\n", bytearray(3)
+        )
+        self.assertRaises(ValueError, machine.encrypt, "ABc")
+
+    def test__decrypt_bytes(self):
+        """Ensure that System97.decrypt_bytes decrypts the supplied
+        ciphertext bytes.
+        """
+
+        machine = system97.machine.System97(**settings)
+
+        self.assertEqual(
+            plaintext.encode("ascii"),
+            machine.decrypt_bytes(bytearray(ciphertext, "ascii")),
+        )
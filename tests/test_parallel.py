@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# test_parallel.py
+# Copyright (c) 2020 Hugh Coleman
+#
+# This file is part of hughcoleman/system97, a historically accurate simulator
+# of the "System 97" or Type-B Cipher Machine. It is released under the MIT
+# License (see LICENSE.)
+import unittest
+
+import system97.machine
+import system97.parallel
+import system97.plugboard
+from tests import ciphertext, plaintext, settings
+
+
+class CountingSystem97(system97.machine.System97):
+    """ A System97 which counts the number of machines constructed. """
+
+    constructed = 0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        CountingSystem97.constructed += 1
+
+
+class TestParallel(unittest.TestCase):
+    def test__parallel_encrypt(self):
+        """Ensure that parallel_encrypt properly encrypts the supplied
+        plaintext, regardless of the number of workers.
+        """
+
+        for workers in [1, 3]:
+            self.assertEqual(
+                ciphertext,
+                system97.parallel.parallel_encrypt(
+                    plaintext, settings, workers=workers
+                ),
+            )
+
+    def test__parallel_decrypt(self):
+        """Ensure that parallel_decrypt properly decrypts the supplied
+        ciphertext, regardless of the number of workers.
+        """
+
+        for workers in [1, 3]:
+            self.assertEqual(
+                plaintext,
+                system97.parallel.parallel_decrypt(
+                    ciphertext, settings, workers=workers
+                ),
+            )
+
+    def test__decrypt_many(self):
+        """Ensure that decrypt_many decrypts each message with its own
+        settings, and returns the results in input order.
+        """
+
+        messages = []
+        for sixes in range(5):
+            for speeds in [(1, 2, 3), (2, 3, 1)]:
+                kwargs = dict(
+                    settings,
+                    positions={6: sixes, 20: (sixes, 0, 24)},
+                    speeds=speeds,
+                )
+                messages.append((kwargs, ciphertext[sixes * 50 :]))
+
+        expected = [
+            system97.machine.System97(**kwargs).decrypt(text)
+            for kwargs, text in messages
+        ]
+
+        for workers in [1, 2]:
+            self.assertEqual(
+                expected,
+                system97.parallel.decrypt_many(messages, workers=workers),
+            )
+
+    def test__encrypt_many(self):
+        """Ensure that encrypt_many agrees with the reference machine."""
+
+        messages = [(settings, plaintext), ({}, plaintext[:100])]
+
+        self.assertEqual(
+            [ciphertext, system97.machine.System97().encrypt(plaintext[:100])],
+            system97.parallel.encrypt_many(messages),
+        )
+
+    def test__decrypt_many_shared(self):
+        """Ensure that decrypt_many agrees with constructing a new machine for
+        each message, when many messages share each machine.
+        """
+
+        messages = [
+            (
+                dict(settings, positions={6: k % 25, 20: (k % 7, k % 11, 3)}),
+                ciphertext[k : k + 20],
+            )
+            for k in range(0, 1000, 2)
+        ]
+
+        self.assertEqual(
+            [
+                system97.machine.System97(**kwargs).decrypt(text)
+                for kwargs, text in messages
+            ],
+            system97.parallel.decrypt_many(messages),
+        )
+
+    def test__decrypt_many_defaults(self):
+        """Ensure that decrypt_many groups messages which omit a setting with
+        those which give its default, and plugboards with their wiring.
+        """
+
+        plugboard = settings["plugboard"]
+        messages = [
+            ({}, ciphertext[:50]),
+            ({"speeds": (1, 2, 3)}, ciphertext[50:100]),
+            ({"plugboard": system97.machine.System97().plugboard}, ciphertext),
+            (settings, ciphertext),
+            (
+                dict(
+                    settings, plugboard=system97.plugboard.Plugboard(plugboard)
+                ),
+                ciphertext[:100],
+            ),
+        ]
+
+        CountingSystem97.constructed = 0
+        output = system97.parallel.decrypt_many(
+            messages, workers=1, engine=CountingSystem97
+        )
+
+        self.assertEqual(2, CountingSystem97.constructed)
+        self.assertEqual(
+            [
+                system97.machine.System97(**kwargs).decrypt(text)
+                for kwargs, text in messages
+            ],
+            output,
+        )
+
+    def test__resolve_workers(self):
+        """Ensure that resolve_workers defaults to at least one worker, and
+        rejects fewer than one.
+        """
+
+        self.assertGreaterEqual(system97.parallel.resolve_workers(None), 1)
+        self.assertEqual(3, system97.parallel.resolve_workers(3))
+
+        for workers in [0, -3]:
+            self.assertRaises(
+                ValueError, system97.parallel.resolve_workers, workers
+            )
+            self.assertRaises(
+                ValueError,
+                system97.parallel.decrypt_many,
+                [({}, ciphertext)],
+                workers=workers,
+            )
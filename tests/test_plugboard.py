@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# test_plugboard.py
+# Copyright (c) 2020 Hugh Coleman
+#
+# This file is part of hughcoleman/system97, a historically accurate simulator
+# of the "System 97" or Type-B Cipher Machine. It is released under the MIT
+# License (see LICENSE.)
+import unittest
+
+import system97.machine
+import system97.plugboard
+
+
+class TestPlugboard(unittest.TestCase):
+    def test__illegal_wiring(self):
+        """Ensure that Plugboard.__init__ raises a ValueError if the supplied
+        wiring is not a permutation of the alphabet.
+        """
+
+        illegal_wirings = [
+            "",
+            "ABCDEFGHIJKLMNOPQRSTUVWXY",
+            "ABCDEFGHIJKLMNOPQRSTUVWXYY",
+            "abcdefghijklmnopqrstuvwxyz",
+        ]
+
+        for wiring in illegal_wirings:
+            self.assertRaises(ValueError, system97.plugboard.Plugboard, wiring)
+
+        self.assertRaises(
+            ValueError,
+            system97.machine.System97,
+            plugboard="ABCDEFGHIJKLMNOPQRSTUVWXYY",
+        )
+
+    def test__index(self):
+        """Ensure that Plugboard.index behaves like str.index."""
+
+        wiring = "NOKTYUXEQLHBRMPDICJASVWGZF"
+        plugboard = system97.plugboard.Plugboard(wiring)
+
+        for c in wiring:
+            self.assertEqual(wiring.index(c), plugboard.index(c))
+            self.assertEqual(c, plugboard[plugboard.index(c)])
+
+        self.assertRaises(ValueError, plugboard.index, "a")
+
+    def test__translate(self):
+        """Ensure that the forward and reverse lookup tables are inverses of
+        each other, and pass illegible characters through.
+        """
+
+        plugboard = system97.plugboard.Plugboard("NOKTYUXEQLHBRMPDICJASVWGZF")
+        text = b"FOVTATAKIDASI-NIMUI/MINO MOXIWO"
+
+        indices = text.translate(plugboard.forward)
+        self.assertEqual(indices[13:14], b"-")
+        self.assertEqual(text, indices.translate(plugboard.reverse))
+
+        self.assertIn(
+            system97.plugboard.INVALID, b"ABc".translate(plugboard.forward)
+        )
+
+    def test__encode(self):
+        """Ensure that Plugboard.encode translates a buffer of letters to
+        their inputs, and rejects any character which is not wired.
+        """
+
+        plugboard = system97.plugboard.Plugboard("NOKTYUXEQLHBRMPDICJASVWGZF")
+
+        text = b"NOK-TYU/XE Q"
+        self.assertEqual(
+            bytes(
+                plugboard.index(chr(c)) if chr(c) not in "-/ " else c
+                for c in text
+            ),
+            plugboard.encode(bytearray(text)),
+        )
+
+        with self.assertRaisesRegex(ValueError, "'c'"):
+            plugboard.encode(memoryview(b"ABc"))
+
+    def test__shared(self):
+        """Ensure that a Plugboard can be shared between machines, and
+        compares equal to its wiring.
+        """
+
+        plugboard = system97.plugboard.Plugboard("NOKTYUXEQLHBRMPDICJASVWGZF")
+
+        a = system97.machine.System97(plugboard=plugboard)
+        b = system97.machine.System97(plugboard=plugboard)
+
+        self.assertIs(plugboard, a.plugboard)
+        self.assertIs(plugboard, b.plugboard)
+        self.assertEqual("NOKTYUXEQLHBRMPDICJASVWGZF", a.plugboard)
+        self.assertEqual(a.encrypt("HELLOWORLD"), b.encrypt("HELLOWORLD"))
@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# test_scoring.py
+# Copyright (c) 2020 Hugh Coleman
+#
+# This file is part of hughcoleman/system97, a historically accurate simulator
+# of the "System 97" or Type-B Cipher Machine. It is released under the MIT
+# License (see LICENSE.)
+import collections
+import os
+import tempfile
+import unittest
+
+import system97.machine
+import system97.search
+from tests import HAVE_NUMPY, ciphertext, plaintext, settings
+
+if HAVE_NUMPY:
+    import system97.scoring
+
+# the counts of the quadgrams in the sample plaintext, skipping those which
+# contain illegible characters
+quadgrams = collections.Counter(
+    plaintext[k : k + 4]
+    for k in range(len(plaintext) - 3)
+    if plaintext[k : k + 4].isalpha()
+)
+
+
+@unittest.skipUnless(HAVE_NUMPY, "requires numpy")
+class TestScoring(unittest.TestCase):
+    def setUp(self):
+        self.model = system97.scoring.NGrams.from_counts(quadgrams)
+
+    def test__mapping(self):
+        """Ensure that the model behaves as a mapping from the observed
+        n-grams to their log-probabilities.
+        """
+
+        self.assertEqual(len(quadgrams), len(self.model))
+        self.assertEqual(set(quadgrams), set(self.model))
+        self.assertIn(plaintext[:4], self.model)
+        self.assertNotIn("QQQQ", self.model)
+        self.assertNotIn("Q-QQ", self.model)
+        self.assertEqual(None, self.model.get("QQQQ"))
+        self.assertLess(self.model.floor, min(self.model.values()))
+
+    def test__score(self):
+        """Ensure that texts are scored by the sum of the log-probabilities of
+        their n-grams, with unobserved n-grams (and those containing
+        illegible characters) scoring the floor.
+        """
+
+        for text in [plaintext, plaintext[:3], "QQQQQ", "THIS-IS"]:
+            self.assertAlmostEqual(
+                sum(
+                    self.model.get(text[k : k + 4], self.model.floor)
+                    for k in range(len(text) - 3)
+                ),
+                self.model.score(text),
+                places=3,
+            )
+
+    def test__score_at(self):
+        """Ensure that the n-grams beginning at the supplied offsets are
+        scored identically to their sum.
+        """
+
+        starts = range(0, len(plaintext) - 3, 7)
+        self.assertAlmostEqual(
+            sum(
+                self.model.get(plaintext[k : k + 4], self.model.floor)
+                for k in starts
+            ),
+            self.model.score_at(list(plaintext), starts),
+            places=3,
+        )
+
+    def test__score_batch(self):
+        """ Ensure that batches are scored identically to single texts. """
+
+        for texts in [
+            [plaintext[k : k + 100] for k in range(0, 1000, 100)],
+            [plaintext[:10], plaintext[:200], "", "-"],
+            [],
+        ]:
+            scores = self.model.score_batch(texts)
+
+            self.assertEqual(len(texts), len(scores))
+            for text, score in zip(texts, scores):
+                self.assertAlmostEqual(self.model.score(text), score, places=3)
+
+    def test__save_load(self):
+        """Ensure that models survive a round trip through the binary format,
+        with or without memory-mapping.
+        """
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "quadgrams")
+            self.model.save(path)
+
+            for mmap in [True, False]:
+                model = system97.scoring.NGrams.load(path, mmap=mmap)
+
+                self.assertEqual(self.model.n, model.n)
+                self.assertEqual(self.model.floor, model.floor)
+                self.assertEqual(self.model.ceiling, model.ceiling)
+                self.assertEqual(
+                    self.model.score(plaintext), model.score(plaintext)
+                )
+                del model
+
+            # the ceiling is read from the header, rather than the table
+            system97.scoring.NGrams(
+                self.model.n, self.model.table, self.model.floor, -0.25
+            ).save(path)
+            self.assertEqual(-0.25, system97.scoring.NGrams.load(path).ceiling)
+
+            with open(path, "r+b") as fh:
+                fh.write(b"JUNK")
+            with self.assertRaises(ValueError):
+                system97.scoring.NGrams.load(path)
+
+    def test__read(self):
+        """ Ensure that models can be read from files of n-gram counts. """
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "quadgrams.txt")
+            with open(path, "w") as fh:
+                for ngram, count in quadgrams.items():
+                    fh.write(f"{ngram} {count}\n")
+
+            model = system97.scoring.NGrams.read(path)
+
+        self.assertEqual(self.model.score(plaintext), model.score(plaintext))
+
+    def test__solve_plugboard(self):
+        """ Ensure that models can be used to score solve_plugboard. """
+
+        machine = system97.machine.System97(**settings)
+
+        result = system97.search.solve_plugboard(
+            ciphertext,
+            machine.snapshot(),
+            "NOKTYU",
+            self.model,
+            iterations=3000,
+            seed=97,
+        )
+
+        self.assertEqual(settings["plugboard"], result["plugboard"])
@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# test_script.py
+# Copyright (c) 2020 Hugh Coleman
+#
+# This file is part of hughcoleman/system97, a historically accurate simulator
+# of the "System 97" or Type-B Cipher Machine. It is released under the MIT
+# License (see LICENSE.)
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from tests import ciphertext, plaintext
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.join(ROOT, "scripts", "system97")
+
+arguments = [
+    "-d",
+    "-s",
+    "9-1,24,6-23",
+    "-p",
+    "NOKTYUXEQLHBRMPDICJASVWGZF",
+]
+
+
+def run(*args, stdin=None, env=None):
+    """ Run scripts/system97 with the supplied arguments. """
+
+    return subprocess.run(
+        [sys.executable, SCRIPT, *arguments, *args],
+        input=stdin,
+        capture_output=True,
+        text=True,
+        env=dict(os.environ, PYTHONPATH=ROOT, **(env or {})),
+    )
+
+
+class TestScript(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+
+        self.input = os.path.join(directory.name, "ciphertext")
+        with open(self.input, "w") as fh:
+            fh.write(ciphertext)
+
+        self.output = os.path.join(directory.name, "plaintext")
+
+    def test__mmap(self):
+        """Ensure that memory-mapping the input, whether requested or chosen
+        automatically, produces the same output as reading it.
+        """
+
+        expected = run(self.input)
+        self.assertEqual(0, expected.returncode, expected.stderr)
+        self.assertEqual(plaintext + "\n", expected.stdout)
+
+        for result in [
+            run("--mmap", self.input),
+            run(self.input, env={"SYSTEM97_MMAP_THRESHOLD": "1"}),
+        ]:
+            self.assertEqual(0, result.returncode, result.stderr)
+            self.assertEqual(expected.stdout, result.stdout)
+
+    def test__mmap_pipe(self):
+        """Ensure that input which cannot be memory-mapped, such as a pipe, is
+        read instead.
+        """
+
+        result = run("--mmap", "-", stdin=ciphertext)
+
+        self.assertEqual(0, result.returncode, result.stderr)
+        self.assertEqual(plaintext + "\n", result.stdout)
+
+    def test__mmap_invalid(self):
+        """Ensure that characters which are not wired into the plugboard are
+        reported when memory-mapping the input.
+        """
+
+        with open(self.input, "a") as fh:
+            fh.write("a")
+
+        result = run("--mmap", self.input)
+
+        self.assertNotEqual(0, result.returncode)
+        self.assertIn("ValueError", result.stderr)
+        self.assertNotIn("BufferError", result.stderr)
+
+    def test__mmap_usage(self):
+        """Ensure that a malformed SYSTEM97_MMAP_THRESHOLD, or --mmap combined
+        with --jobs, is reported as a usage error.
+        """
+
+        for result in [
+            run(self.input, env={"SYSTEM97_MMAP_THRESHOLD": "64M"}),
+            run("--mmap", "--jobs", "2", self.input),
+        ]:
+            self.assertEqual(2, result.returncode)
+            self.assertIn("error:", result.stderr)
+            self.assertNotIn("Traceback", result.stderr)
+
+    def test__jobs(self):
+        """Ensure that sharding the input between several worker processes
+        produces the same output as a single process, and that fewer than one
+        worker is reported as a usage error.
+        """
+
+        expected = run(self.input)
+        result = run("--jobs", "3", self.input)
+
+        self.assertEqual(0, result.returncode, result.stderr)
+        self.assertEqual(expected.stdout, result.stdout)
+
+        for jobs in ["0", "-3"]:
+            result = run("--jobs", jobs, self.input)
+
+            self.assertEqual(2, result.returncode)
+            self.assertIn("error:", result.stderr)
+            self.assertNotIn("Traceback", result.stderr)
+
+    def test__output(self):
+        """ Ensure that output is written to the file given by --output. """
+
+        for args in [[], ["--mmap"]]:
+            result = run(*args, "-o", self.output, self.input)
+
+            self.assertEqual(0, result.returncode, result.stderr)
+            self.assertEqual("", result.stdout)
+            with open(self.output, "r") as fh:
+                self.assertEqual(plaintext + "\n", fh.read())
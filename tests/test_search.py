@@ -0,0 +1,197 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# test_search.py
+# Copyright (c) 2020 Hugh Coleman
+#
+# This file is part of hughcoleman/system97, a historically accurate simulator
+# of the "System 97" or Type-B Cipher Machine. It is released under the MIT
+# License (see LICENSE.)
+import collections
+import math
+import unittest
+
+import system97.engine
+import system97.machine
+import system97.search
+from tests import ciphertext, plaintext, settings
+
+# the log-frequencies of the letters in the sample plaintext
+frequencies = {
+    c: math.log((plaintext.count(c) + 1) / len(plaintext))
+    for c in system97.machine.System97.CHARSET
+}
+
+
+# the log-probabilities of the quadgrams in the sample plaintext
+quadgrams = collections.Counter(
+    plaintext[k : k + 4] for k in range(len(plaintext) - 3)
+)
+quadgrams = {
+    q: math.log(count / sum(quadgrams.values()))
+    for q, count in quadgrams.items()
+}
+
+
+def unigrams(text):
+    """ Score a plaintext by the log-frequencies of its letters. """
+
+    return sum(frequencies.get(c, 0) for c in text)
+
+
+class TestSearch(unittest.TestCase):
+    def test__search_twenties(self):
+        """Ensure that search_twenties ranks the correct twenties positions
+        first.
+        """
+
+        # search from partway through the message
+        machine = system97.machine.System97(**settings)
+        machine.advance(100)
+        state = machine.snapshot()
+
+        results = system97.search.search_twenties(
+            ciphertext[100:200],
+            settings["plugboard"],
+            state[0],
+            unigrams,
+            top=3,
+            speeds=[settings["speeds"]],
+            workers=2,
+        )
+
+        self.assertEqual(3, len(results))
+        self.assertEqual(state, results[0][1])
+
+        # the search should leave the trajectory cache alone
+        cached = system97.engine.trajectory.cache_info()
+        self.assertEqual(
+            results,
+            system97.search.search_twenties(
+                ciphertext[100:200],
+                settings["plugboard"],
+                state[0],
+                unigrams,
+                top=3,
+                speeds=[settings["speeds"]],
+                workers=1,
+            ),
+        )
+        self.assertEqual(cached, system97.engine.trajectory.cache_info())
+
+    def test__solve_plugboard(self):
+        """Ensure that solve_plugboard recovers the twenties letters of the
+        plugboard, and reports the score of the plugboard that it returns.
+        """
+
+        machine = system97.machine.System97(**settings)
+        state = machine.snapshot()
+
+        result = system97.search.solve_plugboard(
+            ciphertext, state, "NOKTYU", quadgrams, iterations=3000, seed=97
+        )
+
+        self.assertEqual(settings["plugboard"], result["plugboard"])
+
+        # the incrementally-maintained score should match a full rescoring
+        machine = system97.machine.System97(plugboard=result["plugboard"])
+        machine.restore(state)
+        decrypted = machine.decrypt(ciphertext)
+        floor = min(quadgrams.values()) - 1.0
+
+        self.assertAlmostEqual(
+            sum(
+                quadgrams.get(decrypted[k : k + 4], floor)
+                for k in range(len(decrypted) - 3)
+            ),
+            result["score"],
+        )
+
+    def test__bounded_search(self):
+        """Ensure that bounded_search returns the same candidates as scoring
+        every candidate in full, while abandoning some of them early.
+        """
+
+        states = [
+            (8, 0, ii, iii, settings["speeds"])
+            for ii in range(25)
+            for iii in range(25)
+        ]
+        floor = min(quadgrams.values()) - 1.0
+
+        machine = system97.machine.System97(plugboard=settings["plugboard"])
+        expected = []
+        for state in states:
+            machine.restore(state)
+            decrypted = machine.decrypt(ciphertext[:300])
+            expected.append(
+                (
+                    sum(
+                        quadgrams.get(decrypted[k : k + 4], floor)
+                        for k in range(len(decrypted) - 3)
+                    ),
+                    state,
+                )
+            )
+        expected.sort(reverse=True)
+
+        # the search should leave the trajectory cache alone
+        cached = system97.engine.trajectory.cache_info()
+
+        # only the best candidate is much better than the rest, so it is the
+        # search for it alone which prunes
+        for top in [3, 1]:
+            result = system97.search.bounded_search(
+                ciphertext[:300],
+                states,
+                settings["plugboard"],
+                quadgrams,
+                top=top,
+            )
+
+            self.assertEqual(
+                [state for _, state in expected[:top]],
+                [state for _, state in result["results"]],
+            )
+            for (a, _), (b, _) in zip(expected, result["results"]):
+                self.assertAlmostEqual(a, b)
+
+        self.assertEqual(expected[0][1], (8, 0, 23, 5, settings["speeds"]))
+        self.assertGreater(result["pruned"], 0)
+        self.assertEqual(cached, system97.engine.trajectory.cache_info())
+
+        with self.assertRaises(ValueError):
+            system97.search.bounded_search(
+                ciphertext, states, settings["plugboard"], quadgrams, top=0
+            )
+
+    def test__equivalent_states(self):
+        """Ensure that equivalent_states partitions the settings into classes
+        of settings under which the switches pass through the same positions.
+        """
+
+        for length, sixes in [(0, 0), (1, 8), (2, 23), (10, 0), (30, 8)]:
+            classes = list(system97.search.equivalent_states(length, sixes))
+
+            self.assertEqual(
+                25 ** 3 * 6, sum(multiplicity for _, multiplicity in classes)
+            )
+
+            # check a few positions exhaustively, including those which step
+            # the slow switch
+            for positions in [(0, 0, 0), (3, 24, 24), (24, 24, 7)]:
+                trajectories = collections.Counter(
+                    system97.engine.trajectory(
+                        (sixes, *positions, speeds), length
+                    )
+                    for speeds in system97.search.SPEEDS
+                )
+
+                expected = collections.Counter()
+                for state, multiplicity in classes:
+                    if state[1:4] == positions:
+                        trajectory = system97.engine.trajectory(state, length)
+
+                        self.assertNotIn(trajectory, expected)
+                        expected[trajectory] = multiplicity
+
+                self.assertEqual(trajectories, expected)
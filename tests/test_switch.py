@@ -80,3 +80,62 @@ class TestSwitch(unittest.TestCase):
                 )
 
             switch.step()
+
+    def test__inverse(self):
+        """Ensure that SteppingSwitch.encrypt and SteppingSwitch.decrypt are
+        inverses of each other at every arm position.
+        """
+
+        switch = system97.switch.SteppingSwitch(system97.logic.TWENTIES_II)
+
+        for position in range(25):
+            for pt in range(6, 26):
+                self.assertEqual(switch.decrypt(switch.encrypt(pt)), pt)
+
+            switch.step()
+
+    def test__named(self):
+        """Ensure that a SteppingSwitch constructed from the name of a wiring
+        routes signals exactly as one constructed from its routing logic.
+        """
+
+        for name in ["SIXES", "TWENTIES_I", "TWENTIES_II", "TWENTIES_III"]:
+            routing_logic = getattr(system97.logic, name)
+            named = system97.switch.SteppingSwitch(name, 3)
+            unpacked = system97.switch.SteppingSwitch(routing_logic, 3)
+
+            self.assertEqual(routing_logic, named.routing_logic)
+            for position in range(25):
+                for n in routing_logic:
+                    self.assertEqual(unpacked.decrypt(n), named.decrypt(n))
+                    self.assertEqual(unpacked.encrypt(n), named.encrypt(n))
+
+                named.step()
+                unpacked.step()
+
+        self.assertRaises(
+            ValueError, system97.switch.SteppingSwitch, "SIXES", 0, 24
+        )
+
+    def test__snapshot(self):
+        """Ensure that SteppingSwitch.restore returns the switch to a state
+        captured by SteppingSwitch.snapshot.
+        """
+
+        switch = system97.switch.SteppingSwitch(system97.logic.SIXES, 24)
+        state = switch.snapshot()
+
+        switch.step()
+        self.assertEqual(0, switch.position)
+
+        switch.restore(state)
+        self.assertEqual(24, switch.position)
+
+    def test__unstep(self):
+        """Ensure that SteppingSwitch.unstep undoes SteppingSwitch.step."""
+
+        switch = system97.switch.SteppingSwitch(system97.logic.SIXES)
+
+        for position in range(25 * 2 + 1):
+            self.assertEqual((-position) % 25, switch.position)
+            switch.unstep()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# test_vectorized.py
+# Copyright (c) 2020 Hugh Coleman
+#
+# This file is part of hughcoleman/system97, a historically accurate simulator
+# of the "System 97" or Type-B Cipher Machine. It is released under the MIT
+# License (see LICENSE.)
+import itertools
+import random
+import string
+import unittest
+
+import system97.machine
+from tests import HAVE_NUMPY, ciphertext, plaintext, settings
+
+if HAVE_NUMPY:
+    import system97.vectorized
+
+
+@unittest.skipUnless(HAVE_NUMPY, "requires numpy")
+class TestVectorizedSystem97(unittest.TestCase):
+    def test__encrypt(self):
+        """Ensure that VectorizedSystem97.encrypt properly encrypts the
+        supplied plaintext.
+        """
+
+        machine = system97.vectorized.VectorizedSystem97(**settings)
+
+        self.assertEqual(ciphertext, machine.encrypt(plaintext))
+
+    def test__decrypt(self):
+        """Ensure that VectorizedSystem97.decrypt properly decrypts the
+        supplied ciphertext.
+        """
+
+        machine = system97.vectorized.VectorizedSystem97(**settings)
+
+        self.assertEqual(plaintext, machine.decrypt(ciphertext))
+
+    def test__reference(self):
+        """Ensure that VectorizedSystem97 is identical to System97 across
+        every speed order, over a message long enough to step the slow switch.
+        """
+
+        rng = random.Random(97)
+        text = "".join(
+            rng.choice(string.ascii_uppercase + "-")
+            for _ in range(25 * 25 * 3)
+        )
+
+        for speeds in itertools.permutations([1, 2, 3]):
+            kwargs = dict(
+                settings, positions={6: 23, 20: (24, 3, 24)}, speeds=speeds
+            )
+
+            reference = system97.machine.System97(**kwargs)
+            machine = system97.vectorized.VectorizedSystem97(**kwargs)
+
+            self.assertEqual(reference.encrypt(text), machine.encrypt(text))
+            self.assertEqual(reference.decrypt(text), machine.decrypt(text))
+
+    def test__decrypt_into(self):
+        """Ensure that VectorizedSystem97.decrypt_into writes the plaintext
+        into the supplied buffer.
+        """
+
+        machine = system97.vectorized.VectorizedSystem97(**settings)
+
+        output = bytearray(len(ciphertext))
+        machine.decrypt_into(ciphertext.encode("ascii"), output)
+        self.assertEqual(plaintext.encode("ascii"), output)
+
+    def test__invalid(self):
+        """Ensure that VectorizedSystem97 rejects characters that are not
+        wired into the plugboard.
+        """
+
+        machine = system97.vectorized.VectorizedSystem97(**settings)
+
+        self.assertRaises(ValueError, machine.encrypt, "ABCd")
+
+        # the character is reported before the machine is stepped, even when
+        # it lies beyond the first chunk
+        state = machine.snapshot()
+        self.assertRaises(
+            ValueError,
+            machine.decrypt,
+            "A" * (system97.vectorized.CHUNK + 1) + "a",
+        )
+        self.assertEqual(state, machine.snapshot())